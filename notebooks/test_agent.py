@@ -1,5 +1,6 @@
 """Example usage of the CoScientist agent."""
 
+import asyncio
 import sys
 from pathlib import Path
 
@@ -22,19 +23,16 @@ def main():
         "How would you design a Python pipeline to analyze protein-ligand binding data from BindingDB?",
     ]
 
-    for i, question in enumerate(questions, 1):
-        print(f"\n{'='*70}")
-        print(f"Question {i}: {question}")
-        print(f"{'='*70}\n")
-
-        response = agent.run(question, verbose=True)
-
-        print(f"\n{'='*70}")
-        print("FINAL ANSWER:")
-        print(f"{'='*70}")
-        print(response)
-        print()
+    # The questions are independent, so answer them concurrently
+    responses = asyncio.run(agent.arun_batch(questions))
 
+    # Build the whole report and write it once rather than line by line
+    rule = "=" * 70
+    parts = []
+    for i, (question, response) in enumerate(zip(questions, responses), 1):
+        parts.append(f"\n{rule}\nQuestion {i}: {question}\n{rule}\nFINAL ANSWER:\n{rule}\n{response}\n\n")
+    sys.stdout.write("".join(parts))
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
@@ -1,21 +1,68 @@
 """Core agent loop for the bioinformatics AI system."""
 
+import copy
+import hashlib
 import json
 import os
 import asyncio
-from typing import Any, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, ClassVar, Optional
 from dataclasses import dataclass
 from src.agent.openrouter_client import OpenRouterClient
 from src.agent.anthropic_client import AnthropicClient
+from src.utils import json_utils
 from src.tools.implementations import (
     execute_python,
-    search_pubmed,
     search_literature,
     query_database,
     read_file,
     find_files,
     get_tool_definitions,
+    prewarm_imports,
 )
+from src.tools._pubmed_cache import cached_search_pubmed
+
+try:
+    import tiktoken
+except ImportError:  # Optional dependency; token counts fall back to a chars/4 estimate
+    tiktoken = None
+
+# Maximum LLM round-trips per run (raised from 10 to allow complex multi-step analyses)
+MAX_ITERATIONS = 30
+
+# Verbose tool-result preview lines
+_TOOL_SUCCESS_LINE = "    → {name} success: {preview}..."
+_TOOL_ERROR_LINE = "    → {name} error: {error}"
+
+# Separator rule for verbose run banners
+_RULE = "=" * 60
+_BANNER_OPEN = "\n" + _RULE
+_BANNER_CLOSE = _RULE + "\n"
+
+
+# Tokenizer for history trimming, loaded on first use by _token_encoding()
+_encoding = None
+_encoding_loaded = False
+
+
+def _token_encoding():
+    """Load the cl100k_base tokenizer once; None if tiktoken is unavailable.
+
+    tiktoken downloads the encoding on first use, so an offline machine falls
+    back to the chars/4 estimate instead of failing.
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        if tiktoken is not None:
+            try:
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                _encoding = None
+    return _encoding
 
 
 def get_max_tokens_for_model(model_name: str) -> int:
@@ -46,7 +93,39 @@ class AgentPersona:
 class BioinformaticsAgent:
     """Agent for answering complex bioinformatics questions."""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "claude-sonnet-4-20250514", provider: str = "anthropic", data_dir: str = "/home.galaxy4/sumin/project/aisci/Competition_Data", input_dir: Optional[str] = None):
+    # Default iteration limit (instances may override max_iterations)
+    MAX_ITERATIONS: ClassVar[int] = MAX_ITERATIONS
+
+    # Read-only tools whose results are memoized per (tool, arguments)
+    CACHEABLE_TOOLS = frozenset({"search_pubmed", "read_file", "query_database"})
+    TOOL_CACHE_SIZE = 256
+    # Tools that do not mutate shared state and may run concurrently. Others
+    # (execute_python's persistent namespace, PaperQA's on-disk index) run
+    # serially in the order the model requested them.
+    READONLY_TOOLS = {
+        "execute_python": False,
+        "search_pubmed": True,
+        "search_literature": False,
+        "query_database": True,
+        "read_file": True,
+        "find_files": True,
+    }
+    MAX_READONLY_WORKERS = 10
+    # Tool results from older iterations are replaced with short summaries
+    FULL_TOOL_RESULT_ITERATIONS = 3
+    TOOL_SUMMARY_CHARS = 200
+    # Output budgets: turns that follow a lookup result mostly emit tool calls
+    # (several per turn), and the critic writes a short structured review
+    ROUTING_MAX_TOKENS = 2048
+    CRITIC_MAX_TOKENS = 800
+    # Upper bound on files scanned when correcting a mistyped read_file path
+    RULE_SCAN_FILE_LIMIT = 5000
+    # Prompt size the history is trimmed to fit (smallest context among the
+    # supported models), less the output budget and a safety margin
+    CONTEXT_LIMIT_TOKENS = 128_000
+    CONTEXT_MARGIN_TOKENS = 1000
+
+    def __init__(self, api_key: Optional[str] = None, model: str = "claude-sonnet-4-20250514", provider: str = "anthropic", data_dir: str = "/home.galaxy4/sumin/project/aisci/Competition_Data", input_dir: Optional[str] = None, stream: bool = True):
         """Initialize the agent.
 
         Args:
@@ -55,6 +134,7 @@ class BioinformaticsAgent:
             provider: 'anthropic' or 'openrouter'
             data_dir: Path to database directory (Drug databases, PPI, GWAS, etc.)
             input_dir: Path to question-specific input data (defaults to data_dir)
+            stream: Stream responses so tool calls start while the model decodes
         """
         if provider == "anthropic":
             self.client = AnthropicClient(api_key=api_key, model=model)
@@ -62,16 +142,31 @@ class BioinformaticsAgent:
             self.client = OpenRouterClient(api_key=api_key, model=model)
         self.data_dir = data_dir
         self.input_dir = input_dir if input_dir is not None else data_dir
+        self.stream = stream
         self.tools = {
             "execute_python": execute_python,
-            "search_pubmed": search_pubmed,
+            # Identical searches are served from the on-disk PubMed cache
+            "search_pubmed": cached_search_pubmed,
             "search_literature": search_literature,
             "query_database": query_database,
             "read_file": read_file,
             "find_files": find_files,
         }
+        # Tool schemas and the system prompt are fixed for a run; build them once
+        self._tool_definitions = get_tool_definitions()
+        self._system_prompt = ""
         self.conversation_history = []
-        self.max_iterations = 30  # Increased from 10 to allow complex multi-step analyses
+        self._tool_turns: list[list[dict[str, Any]]] = []
+        # id(message) -> (content object, tool_calls object, token count)
+        self._token_counts: dict[int, tuple[Any, Any, int]] = {}
+        self._last_assistant_text = ""
+        self._tool_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._tool_cache_lock = threading.Lock()
+        self.max_iterations = self.MAX_ITERATIONS
+        # LLM round-trips avoided by _apply_tool_rules
+        self.saved_llm_calls = 0
+        # Overlap the pandas import with the first LLM round-trip
+        prewarm_imports()
 
     def get_system_prompt(self) -> str:
         """Get the system prompt for scientific reasoning.
@@ -169,8 +264,25 @@ Remember: Your goal is to help scientists make informed decisions, not to provid
             # Add data_dir to find_files calls
             elif tool_name == "find_files":
                 tool_input["data_dir"] = self.data_dir
-            result = tool_func(**tool_input)
-            return result.to_dict()
+
+            cache_key = None
+            if tool_name in self.CACHEABLE_TOOLS:
+                cache_key = self._tool_cache_key(tool_name, tool_input)
+                with self._tool_cache_lock:
+                    cached = self._tool_cache.get(cache_key)
+                    if cached is not None:
+                        self._tool_cache.move_to_end(cache_key)
+                        return dict(cached)
+
+            result = tool_func(**tool_input).to_dict()
+
+            # Only successful results are cached so transient failures are retried
+            if cache_key is not None and result["success"]:
+                with self._tool_cache_lock:
+                    self._tool_cache[cache_key] = result
+                    if len(self._tool_cache) > self.TOOL_CACHE_SIZE:
+                        self._tool_cache.popitem(last=False)
+            return dict(result)
         except TypeError as e:
             return {
                 "success": False,
@@ -184,6 +296,162 @@ Remember: Your goal is to help scientists make informed decisions, not to provid
                 "error": f"Tool execution error: {str(e)}",
             }
 
+    def _tool_cache_key(self, tool_name: str, tool_input: dict[str, Any]) -> str:
+        """Build the memoization key for a read-only tool call.
+
+        Args:
+            tool_name: Name of the tool
+            tool_input: Arguments, after data_dir/input_dir injection
+
+        Returns:
+            Hex digest identifying the call
+        """
+        key = f"{tool_name}:{json_utils.dumps_canonical(tool_input)}"
+        if tool_name == "read_file":
+            # Files may be rewritten by execute_python; key on their current version
+            try:
+                stat = (Path(tool_input.get("input_dir", "")) / str(tool_input.get("file_path", ""))).stat()
+                key += f":{stat.st_mtime_ns}:{stat.st_size}"
+            except OSError:
+                pass
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    def _format_tool_result(self, tool_call: dict[str, Any], result: dict[str, Any]) -> dict[str, Any]:
+        """Format a tool result as an OpenAI-spec tool message.
+
+        Args:
+            tool_call: Tool call dict with 'id', 'name', 'input'
+            result: Result dict returned by call_tool
+
+        Returns:
+            Tool message dict for the conversation history
+        """
+        # Truncate large results to avoid context overflow
+        result_str = json_utils.dumps(result)
+        if len(result_str) > 5000:
+            result_truncated = {
+                "success": result.get("success"),
+                "output": str(result.get("output"))[:4500] + "...[truncated]",
+                "error": result.get("error")
+            }
+            result_str = json_utils.dumps(result_truncated)
+
+        return {
+            "role": "tool",
+            "tool_call_id": tool_call.get("id", ""),
+            "name": tool_call["name"],
+            "content": result_str
+        }
+
+    def _execute_tool_calls(self, tool_calls: list[dict[str, Any]], verbose: bool = False) -> list[dict[str, Any]]:
+        """Execute the tool calls of one iteration concurrently.
+
+        Read-only tools are I/O-bound (HTTP, disk), so they are dispatched on a
+        thread pool. Mutating tools go to a single-worker pool and run in the
+        order the model requested them. Results keep the original order.
+
+        Args:
+            tool_calls: Tool call dicts with 'id', 'name', 'input'
+            verbose: Print intermediate steps
+
+        Returns:
+            Result dicts from call_tool, in the original call order
+        """
+        if verbose:
+            for tool_call in tool_calls:
+                print(f"  Calling {tool_call['name']}({json.dumps(tool_call['input'])})...")
+
+        with ThreadPoolExecutor(max_workers=min(len(tool_calls), self.MAX_READONLY_WORKERS)) as pool, \
+                ThreadPoolExecutor(max_workers=1) as serial_pool:
+            futures = [self._submit_tool_call(tc, pool, serial_pool) for tc in tool_calls]
+            return [future.result() for future in futures]
+
+    def _is_readonly(self, tool_name: str) -> bool:
+        """Whether a tool may run concurrently with other calls."""
+        return self.READONLY_TOOLS.get(tool_name, False)
+
+    def _submit_tool_call(self, tool_call: dict[str, Any], pool: ThreadPoolExecutor, serial_pool: ThreadPoolExecutor) -> Future:
+        """Submit a tool call to the appropriate pool.
+
+        Args:
+            tool_call: Tool call dict with 'id', 'name', 'input'
+            pool: Pool for read-only tools
+            serial_pool: Single-worker pool that keeps mutating calls in order
+
+        Returns:
+            Future resolving to the call_tool result dict
+        """
+        target = pool if self._is_readonly(tool_call["name"]) else serial_pool
+        return target.submit(self._call_parsed_tool, tool_call)
+
+    def _call_parsed_tool(self, tool_call: dict[str, Any]) -> dict[str, Any]:
+        """Run a tool call, or report why it could not be parsed.
+
+        A malformed call still gets a result under its id, so the model sees
+        the error and every tool call in the turn is answered.
+
+        Args:
+            tool_call: Tool call dict with 'id', 'name', 'input' and
+                optionally 'error'
+
+        Returns:
+            Result dict as returned by call_tool
+        """
+        if tool_call.get("error"):
+            return {"success": False, "output": None, "error": tool_call["error"]}
+        return self.call_tool(tool_call["name"], tool_call["input"])
+
+    def _stream_turn(self, call_params: dict[str, Any], pool: ThreadPoolExecutor, serial_pool: ThreadPoolExecutor, verbose: bool = False) -> tuple[dict[str, Any], dict[int, Future]]:
+        """Stream one LLM turn, submitting tool calls while the model decodes.
+
+        Args:
+            call_params: Arguments for client.stream_message
+            pool: Pool for read-only tools
+            serial_pool: Single-worker pool for mutating tools
+            verbose: Print intermediate steps
+
+        Returns:
+            Tuple of (assembled response, tool futures keyed by call index)
+        """
+        futures: dict[int, Future] = {}
+        response: dict[str, Any] = {}
+
+        for event, payload in self.client.stream_message(**call_params):
+            if event == "tool_call":
+                if verbose:
+                    print(f"  Calling {payload['name']}({json.dumps(payload['input'])})...")
+                futures[payload["index"]] = self._submit_tool_call(payload, pool, serial_pool)
+            else:
+                response = payload
+
+        return response, futures
+
+    def _collect_tool_results(self, tool_calls: list[dict[str, Any]], results: list[dict[str, Any]], verbose: bool = False) -> list[dict[str, Any]]:
+        """Turn tool results into tool messages, in call order.
+
+        Args:
+            tool_calls: Tool call dicts with 'id', 'name', 'input'
+            results: Result dicts from call_tool, aligned with tool_calls
+            verbose: Print intermediate steps
+
+        Returns:
+            List of tool messages
+        """
+        tool_results = [
+            self._format_tool_result(tool_call, result)
+            for tool_call, result in zip(tool_calls, results)
+        ]
+        if verbose:
+            # One write for the whole batch of previews
+            print("\n".join(
+                _TOOL_SUCCESS_LINE.format(name=tool_call["name"], preview=str(result["output"])[:200])
+                if result["success"]
+                else _TOOL_ERROR_LINE.format(name=tool_call["name"], error=result["error"])
+                for tool_call, result in zip(tool_calls, results)
+            ))
+
+        return tool_results
+
     def process_response(self, response: dict[str, Any]) -> tuple[Optional[str], list[dict[str, Any]]]:
         """Process API response and extract text and tool calls.
 
@@ -197,132 +465,526 @@ Remember: Your goal is to help scientists make informed decisions, not to provid
         tool_calls = self.client.extract_tool_calls(response)
         return text, tool_calls
 
-    def run(self, user_question: str, verbose: bool = False) -> str:
-        """Run the agent loop for a user question.
+    def _start_run(self, user_question: str, verbose: bool = False):
+        """Reset the conversation for a new question.
 
         Args:
             user_question: The question to answer
             verbose: Print intermediate steps
-
-        Returns:
-            Final response from the agent
         """
+        self._system_prompt = self.get_system_prompt()
         self.conversation_history = [
-            {"role": "system", "content": self.get_system_prompt()}
+            {"role": "system", "content": self._system_prompt}
         ]
+        self._tool_turns = []
+        self._token_counts = {}
+        self._last_assistant_text = ""
         self.add_message("user", user_question)
 
         if verbose:
-            print(f"\n{'='*60}")
+            print(_BANNER_OPEN)
             print(f"Question: {user_question}")
-            print(f"{'='*60}\n")
+            print(_BANNER_CLOSE)
 
-        for iteration in range(self.max_iterations):
+    def _budget_for(self, iteration: int) -> int:
+        """Pick max_tokens for the next LLM call.
+
+        A turn that follows lookup results (file, database and literature
+        tools) usually only routes to more tools, so it gets
+        ROUTING_MAX_TOKENS. The first turn, turns that follow execute_python
+        output (usually answered with more code) and the last few
+        iterations, where a final answer is likely, get the model's full
+        limit.
+
+        Args:
+            iteration: Zero-based iteration index
+
+        Returns:
+            max_tokens for the request
+        """
+        full_budget = get_max_tokens_for_model(self.client.model)
+        last_message = self.conversation_history[-1] if self.conversation_history else {}
+        if last_message.get("role") != "tool" or iteration >= self.max_iterations - 3:
+            return full_budget
+        for message in reversed(self.conversation_history):
+            if message.get("role") != "tool":
+                break
+            if message.get("name") == "execute_python":
+                return full_budget
+        return min(full_budget, self.ROUTING_MAX_TOKENS)
+
+    def _message_tokens(self, message: dict[str, Any]) -> int:
+        """Estimate a message's prompt tokens, reusing the count while it is unchanged.
+
+        Args:
+            message: Conversation message
+
+        Returns:
+            Token count (cl100k_base when tiktoken is installed, else chars / 4)
+        """
+        content = message.get("content")
+        tool_calls = message.get("tool_calls")
+        cached = self._token_counts.get(id(message))
+        # Older tool results get their content replaced by a summary, so the
+        # count is only reused while the same content object is in place
+        if cached is not None and cached[0] is content and cached[1] is tool_calls:
+            return cached[2]
+
+        text = content if isinstance(content, str) else json_utils.dumps(content or "")
+        if tool_calls:
+            text += json_utils.dumps(tool_calls)
+        encoding = _token_encoding()
+        if encoding is not None:
+            count = len(encoding.encode(text, disallowed_special=()))
+        else:
+            count = len(text) // 4
+        # Per-message framing (role, separators)
+        count += 4
+        self._token_counts[id(message)] = (content, tool_calls, count)
+        return count
+
+    def _trim_history(self):
+        """Drop the oldest tool-use turns until the prompt fits the context window.
+
+        The system prompt and the first user question are always kept, as is
+        the most recent turn. An assistant message is dropped together with
+        the tool results that answer it, so tool calls stay paired.
+        """
+        budget = (
+            self.CONTEXT_LIMIT_TOKENS
+            - get_max_tokens_for_model(self.client.model)
+            - self.CONTEXT_MARGIN_TOKENS
+        )
+        history = self.conversation_history
+        total = sum(self._message_tokens(message) for message in history)
+        # history[0] is the system prompt and history[1] the user question
+        while total > budget:
+            end = 3
+            while end < len(history) and history[end].get("role") == "tool":
+                end += 1
+            if end >= len(history):
+                break
+            dropped = {id(message) for message in history[2:end]}
+            for message in history[2:end]:
+                total -= self._message_tokens(message)
+                self._token_counts.pop(id(message), None)
+            del history[2:end]
+            # Keep the compaction bookkeeping in step with the history
+            self._tool_turns = [
+                turn for turn in self._tool_turns
+                if not any(id(message) in dropped for message in turn)
+            ]
+
+    def _build_call_params(self, iteration: int = 0) -> dict[str, Any]:
+        """Build the create_message arguments for the next iteration.
+
+        Args:
+            iteration: Zero-based iteration index
+
+        Returns:
+            Keyword arguments for client.create_message / acreate_message
+        """
+        self._trim_history()
+        call_params = {
+            "messages": self.conversation_history,
+            "tools": self._tool_definitions,
+            "temperature": 0.7,
+            "max_tokens": self._budget_for(iteration),
+        }
+
+        # Anthropic API requires system prompt separately
+        if isinstance(self.client, AnthropicClient):
+            call_params["system"] = self._system_prompt
+
+        return call_params
+
+    def _retry_with_full_budget(self, response: dict[str, Any], call_params: dict[str, Any]) -> bool:
+        """Check whether a reduced-budget answer was cut off.
+
+        Only text-only responses are retried, so no tool call from the
+        truncated response has been started. Truncation is reported as
+        finish_reason "length" by OpenRouter and as stop_reason "max_tokens"
+        by Anthropic. On True, call_params is updated to the model's full
+        limit.
+
+        Args:
+            response: Response from create_message
+            call_params: Arguments the response was requested with
+
+        Returns:
+            True if the request should be repeated
+        """
+        full_budget = get_max_tokens_for_model(self.client.model)
+        choices = response.get("choices") or [{}]
+        truncated = choices[0].get("finish_reason") == "length" or response.get("stop_reason") == "max_tokens"
+        if not truncated or call_params["max_tokens"] >= full_budget:
+            return False
+        if self.process_response(response)[1]:
+            return False
+        call_params["max_tokens"] = full_budget
+        return True
+
+    def _handle_response(self, response: dict[str, Any], verbose: bool = False) -> tuple[bool, Optional[str], list[dict[str, Any]]]:
+        """Record an LLM response in the conversation history.
+
+        Args:
+            response: Response from create_message
+            verbose: Print intermediate steps
+
+        Returns:
+            Tuple of (done, response_text, tool_calls). When done is True the
+            text is the final answer and there are no tool calls to run.
+        """
+        text, tool_calls = self.process_response(response)
+
+        # Check if response was truncated (hit token limit)
+        finish_reason = None
+        if response.get("choices") and len(response["choices"]) > 0:
+            finish_reason = response["choices"][0].get("finish_reason")
+
+        if text:
+            self._last_assistant_text = text
             if verbose:
-                print(f"[Iteration {iteration + 1}/{self.max_iterations}]")
-
-            # Get response from LLM
-            # Anthropic API requires system prompt separately
-            call_params = {
-                "messages": self.conversation_history,
-                "tools": get_tool_definitions(),
-                "temperature": 0.7,
-                "max_tokens": get_max_tokens_for_model(self.client.model),
+                print(f"Assistant: {text[:200]}..." if len(text) > 200 else f"Assistant: {text}")
+                if finish_reason:
+                    print(f"[Finish reason: {finish_reason}]")
+
+        # If no tool calls, we're done
+        if not tool_calls:
+            # Warn if response was truncated due to length
+            if finish_reason == "length":
+                if verbose:
+                    print("\n[WARNING: Response was truncated due to max_tokens limit]")
+                    print("[Agent completed - no more tools needed]")
+            elif verbose:
+                print("\n[Agent completed - no more tools needed]")
+            # Add the final assistant message
+            if text:
+                self.add_message("assistant", text)
+            return True, text, []
+
+        if verbose:
+            print(f"[Tools to call: {[tc['name'] for tc in tool_calls]}]")
+
+        # Add assistant message with tool calls (required for proper conversation flow)
+        # Store the raw response message which includes tool_calls
+        if response.get("choices") and response["choices"][0].get("message"):
+            assistant_message = response["choices"][0]["message"]
+            self.conversation_history.append(assistant_message)
+
+        return False, text, tool_calls
+
+    def _add_tool_results(self, tool_results: list[dict[str, Any]]):
+        """Append one iteration's tool messages and compact older ones.
+
+        Every LLM call re-sends the whole history, so once a tool result is
+        more than FULL_TOOL_RESULT_ITERATIONS iterations old (the model has
+        already acted on it) its content is replaced with a short summary.
+
+        Args:
+            tool_results: Tool messages produced by this iteration
+        """
+        self.conversation_history.extend(tool_results)
+        self._tool_turns.append(tool_results)
+
+        if len(self._tool_turns) > self.FULL_TOOL_RESULT_ITERATIONS:
+            for message in self._tool_turns[-self.FULL_TOOL_RESULT_ITERATIONS - 1]:
+                summary = message["content"][:self.TOOL_SUMMARY_CHARS]
+                message["content"] = f"[previous {message['name']} result summary: {summary}]"
+
+    def _resolve_missing_file(self, file_path: str) -> Optional[str]:
+        """Find the file a mistyped read_file path unambiguously refers to.
+
+        Args:
+            file_path: Path the model asked for (relative to input_dir)
+
+        Returns:
+            Corrected path relative to input_dir, or None if not unambiguous
+        """
+        base = Path(self.input_dir)
+        if not base.is_dir():
+            return None
+
+        candidates = []
+        for root, _dirs, files in os.walk(base):
+            for name in files:
+                candidates.append(os.path.relpath(os.path.join(root, name), base))
+            if len(candidates) >= self.RULE_SCAN_FILE_LIMIT:
+                break
+
+        # Only a casing or directory slip is safe to fix: a fuzzy match on
+        # the name could silently swap in a different file (CD4 -> CD8)
+        wanted_name = Path(file_path).name.casefold()
+        same_name = [c for c in candidates if Path(c).name.casefold() == wanted_name]
+        return same_name[0] if len(same_name) == 1 else None
+
+    def _apply_tool_rules(self, tool_calls: list[dict[str, Any]], results: list[dict[str, Any]], verbose: bool = False):
+        """Handle tool failures whose follow-up is obvious without the LLM.
+
+        A read_file that fails with "File not found" for a path that has an
+        unambiguous match under input_dir is retried with the corrected path
+        directly, recorded in the history as if the model had requested it.
+        This saves the round-trip the model would spend fixing the path.
+
+        Args:
+            tool_calls: Tool calls of this iteration
+            results: Their call_tool result dicts, in the same order
+            verbose: Print intermediate steps
+        """
+        for tool_call, result in zip(tool_calls, results):
+            # Decide on the result fields, not the serialized message: a file
+            # that was read fine may itself contain the words "File not found"
+            error = result.get("error") or ""
+            if tool_call["name"] != "read_file" or result["success"] or not error.startswith("File not found"):
+                continue
+            corrected = self._resolve_missing_file(tool_call["input"].get("file_path", ""))
+            if corrected is None:
+                continue
+
+            rule_call = {
+                "id": f"rule_{tool_call['id']}",
+                "name": "read_file",
+                "input": {"file_path": corrected},
             }
+            if verbose:
+                print(f"  [Rule] Retrying read_file with {corrected!r}")
+
+            self.conversation_history.append({
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [{
+                    "id": rule_call["id"],
+                    "type": "function",
+                    "function": {"name": "read_file", "arguments": json.dumps(rule_call["input"])},
+                }],
+            })
+            result = self.call_tool("read_file", dict(rule_call["input"]))
+            self._add_tool_results(self._collect_tool_results([rule_call], [result], verbose=verbose))
+            self.saved_llm_calls += 1
+
+    def _finish_run(self, verbose: bool = False) -> str:
+        """Produce the answer when max_iterations is reached.
 
-            # Add system prompt for Anthropic
-            if isinstance(self.client, AnthropicClient):
-                call_params["system"] = self.get_system_prompt()
+        Args:
+            verbose: Print intermediate steps
 
-            response = self.client.create_message(**call_params)
+        Returns:
+            Last assistant text or empty string
+        """
+        if verbose:
+            print("\n[Max iterations reached]")
 
-            text, tool_calls = self.process_response(response)
+        # Return last assistant text or empty string
+        return self._last_assistant_text
 
-            # Check if response was truncated (hit token limit)
-            finish_reason = None
-            if response.get("choices") and len(response["choices"]) > 0:
-                finish_reason = response["choices"][0].get("finish_reason")
+    def run(self, user_question: str, verbose: bool = False) -> str:
+        """Run the agent loop for a user question.
 
-            if text:
-                if verbose:
-                    print(f"Assistant: {text[:200]}..." if len(text) > 200 else f"Assistant: {text}")
-                    if finish_reason:
-                        print(f"[Finish reason: {finish_reason}]")
-
-            # If no tool calls, we're done
-            if not tool_calls:
-                # Warn if response was truncated due to length
-                if finish_reason == "length":
-                    if verbose:
-                        print("\n[WARNING: Response was truncated due to max_tokens limit]")
-                        print("[Agent completed - no more tools needed]")
-                elif verbose:
-                    print("\n[Agent completed - no more tools needed]")
-                # Add the final assistant message
-                if text:
-                    self.add_message("assistant", text)
-                return text
+        Args:
+            user_question: The question to answer
+            verbose: Print intermediate steps
 
+        Returns:
+            Final response from the agent
+        """
+        self._start_run(user_question, verbose=verbose)
+        if self.stream and hasattr(self.client, "stream_message"):
+            return self._run_streaming(verbose=verbose)
+
+        for iteration in range(self.max_iterations):
             if verbose:
-                print(f"[Tools to call: {[tc['name'] for tc in tool_calls]}]")
+                print(f"[Iteration {iteration + 1}/{self.max_iterations}]", flush=True)
 
-            # Add assistant message with tool calls (required for proper conversation flow)
-            # Store the raw response message which includes tool_calls
-            if response.get("choices") and response["choices"][0].get("message"):
-                assistant_message = response["choices"][0]["message"]
-                self.conversation_history.append(assistant_message)
+            call_params = self._build_call_params(iteration)
+            response = self.client.create_message(**call_params)
+            if self._retry_with_full_budget(response, call_params):
+                response = self.client.create_message(**call_params)
 
-            # Process tool calls
-            tool_results = []
-            for tool_call in tool_calls:
-                tool_name = tool_call["name"]
-                tool_input = tool_call["input"]
-                tool_call_id = tool_call.get("id", "")
+            done, text, tool_calls = self._handle_response(response, verbose=verbose)
+            if done:
+                return text
 
-                if verbose:
-                    print(f"  Calling {tool_name}({json.dumps(tool_input)})...")
+            # Process tool calls concurrently (they are independent I/O-bound requests)
+            results = self._execute_tool_calls(tool_calls, verbose=verbose)
+            tool_results = self._collect_tool_results(tool_calls, results, verbose=verbose)
 
-                # Execute tool
-                result = self.call_tool(tool_name, tool_input)
+            # Add all tool results to conversation
+            self._add_tool_results(tool_results)
+            self._apply_tool_rules(tool_calls, results, verbose=verbose)
+
+        return self._finish_run(verbose=verbose)
+
+    def _run_streaming(self, verbose: bool = False) -> str:
+        """Agent loop for streaming clients, used by run().
 
+        Each tool call is submitted to a thread pool as soon as its arguments
+        have been streamed, so tools execute while the model keeps decoding.
+
+        Args:
+            verbose: Print intermediate steps
+
+        Returns:
+            Final response from the agent
+        """
+        with ThreadPoolExecutor(max_workers=self.MAX_READONLY_WORKERS) as pool, \
+                ThreadPoolExecutor(max_workers=1) as serial_pool:
+            for iteration in range(self.max_iterations):
                 if verbose:
-                    if result["success"]:
-                        result_preview = str(result["output"])[:200]
-                        print(f"    → Success: {result_preview}...")
-                    else:
-                        print(f"    → Error: {result['error']}")
-
-                # Format tool result according to OpenAI spec
-                # Truncate large results to avoid context overflow
-                result_str = json.dumps(result)
-                if len(result_str) > 5000:
-                    result_truncated = {
-                        "success": result.get("success"),
-                        "output": str(result.get("output"))[:4500] + "...[truncated]",
-                        "error": result.get("error")
-                    }
-                    result_str = json.dumps(result_truncated)
-
-                tool_result = {
-                    "role": "tool",
-                    "tool_call_id": tool_call_id,
-                    "name": tool_name,
-                    "content": result_str
-                }
-                tool_results.append(tool_result)
+                    print(f"[Iteration {iteration + 1}/{self.max_iterations}]", flush=True)
+
+                call_params = self._build_call_params(iteration)
+                response, futures = self._stream_turn(call_params, pool, serial_pool, verbose=verbose)
+                if self._retry_with_full_budget(response, call_params):
+                    response, futures = self._stream_turn(call_params, pool, serial_pool, verbose=verbose)
+
+                done, text, tool_calls = self._handle_response(response, verbose=verbose)
+                if done:
+                    for future in futures.values():
+                        future.cancel()
+                    return text
+
+                # Futures are matched by call index, since ids may be missing
+                # or repeated; only calls the stream never yielded are
+                # submitted now
+                pending = [
+                    futures[tc["index"]] if tc["index"] in futures else self._submit_tool_call(tc, pool, serial_pool)
+                    for tc in tool_calls
+                ]
+                results = [future.result() for future in pending]
+                tool_results = self._collect_tool_results(tool_calls, results, verbose=verbose)
+                self._add_tool_results(tool_results)
+                self._apply_tool_rules(tool_calls, results, verbose=verbose)
+
+        return self._finish_run(verbose=verbose)
+
+    def _schedule_tool_call(self, tool_call: dict[str, Any], after: Optional[asyncio.Task] = None, verbose: bool = False) -> asyncio.Task:
+        """Start a tool call in a worker thread as an asyncio task.
 
-            # Add all tool results to conversation
-            self.conversation_history.extend(tool_results)
+        Args:
+            tool_call: Tool call dict with 'id', 'name', 'input'
+            after: Task that must finish first (keeps mutating calls in order)
+            verbose: Print intermediate steps
 
+        Returns:
+            Task resolving to the call_tool result dict
+        """
         if verbose:
-            print("\n[Max iterations reached]")
+            print(f"  Calling {tool_call['name']}({json.dumps(tool_call['input'])})...")
+
+        async def run_call():
+            if after is not None:
+                await asyncio.gather(after, return_exceptions=True)
+            return await asyncio.to_thread(self._call_parsed_tool, tool_call)
+
+        return asyncio.create_task(run_call())
 
-        # Return last assistant message or empty string
-        for msg in reversed(self.conversation_history):
-            if msg["role"] == "assistant":
-                return msg["content"]
+    async def _astream_turn(self, call_params: dict[str, Any], verbose: bool = False) -> tuple[dict[str, Any], dict[int, asyncio.Task]]:
+        """Stream one LLM turn, starting tool calls while the model decodes.
 
-        return ""
+        Args:
+            call_params: Arguments for client.astream_message
+            verbose: Print intermediate steps
+
+        Returns:
+            Tuple of (assembled response, tool tasks keyed by call index)
+        """
+        futures: dict[int, asyncio.Task] = {}
+        last_serial_task = None
+        response: dict[str, Any] = {}
+
+        async for event, payload in self.client.astream_message(**call_params):
+            if event == "tool_call":
+                readonly = self._is_readonly(payload["name"])
+                task = self._schedule_tool_call(payload, after=None if readonly else last_serial_task, verbose=verbose)
+                if not readonly:
+                    last_serial_task = task
+                futures[payload["index"]] = task
+            else:
+                response = payload
+
+        return response, futures
+
+    async def arun(self, user_question: str, verbose: bool = False) -> str:
+        """Async version of run().
+
+        LLM requests go through the client's async API, so several agents can
+        share one event loop instead of each blocking a thread while the model
+        decodes. Tool calls run as asyncio tasks in worker threads: read-only
+        tools concurrently, mutating ones chained in request order. When the
+        client supports streaming (and self.stream is set), each tool call
+        starts executing as soon as its arguments have been streamed,
+        overlapping tool latency with the rest of the decode.
+
+        Args:
+            user_question: The question to answer
+            verbose: Print intermediate steps
+
+        Returns:
+            Final response from the agent
+        """
+        self._start_run(user_question, verbose=verbose)
+        streaming = self.stream and hasattr(self.client, "astream_message")
+
+        for iteration in range(self.max_iterations):
+            if verbose:
+                print(f"[Iteration {iteration + 1}/{self.max_iterations}]", flush=True)
+
+            call_params = self._build_call_params(iteration)
+            futures: dict[int, asyncio.Task] = {}
+            for _ in range(2):
+                if streaming:
+                    response, futures = await self._astream_turn(call_params, verbose=verbose)
+                else:
+                    response = await self.client.acreate_message(**call_params)
+                if not self._retry_with_full_budget(response, call_params):
+                    break
+
+            done, text, tool_calls = self._handle_response(response, verbose=verbose)
+            if done:
+                for task in futures.values():
+                    task.cancel()
+                return text
+
+            # Each tool call runs in a worker thread as its own task. Calls
+            # already started while streaming are reused by call index (ids
+            # may be missing or repeated)
+            last_serial_task = None
+            tasks = []
+            for tool_call in tool_calls:
+                task = futures.get(tool_call.get("index"))
+                if task is None:
+                    after = None if self._is_readonly(tool_call["name"]) else last_serial_task
+                    task = self._schedule_tool_call(tool_call, after=after, verbose=verbose)
+                if not self._is_readonly(tool_call["name"]):
+                    last_serial_task = task
+                tasks.append(task)
+            results = await asyncio.gather(*tasks)
+            tool_results = self._collect_tool_results(tool_calls, results, verbose=verbose)
+
+            self._add_tool_results(tool_results)
+            await asyncio.to_thread(self._apply_tool_rules, tool_calls, results, verbose)
+
+        return self._finish_run(verbose=verbose)
+
+    async def arun_batch(self, questions: list[str], verbose: bool = False) -> list[str]:
+        """Answer several independent questions concurrently.
+
+        Each question runs on a fork with its own conversation history that
+        shares this agent's client and tool cache, so the batch takes about as
+        long as its slowest question. execute_python calls from different
+        questions still go through the one persistent namespace.
+
+        Args:
+            questions: Questions to answer
+            verbose: Print intermediate steps (interleaved across questions)
+
+        Returns:
+            Final responses, in the order of questions
+        """
+        try:
+            return list(await asyncio.gather(*(self._fork().arun(q, verbose=verbose) for q in questions)))
+        finally:
+            await self.client.aclose()
 
     async def run_async(self, user_question: str, verbose: bool = False) -> str:
         """Async version of run() for parallel specialist execution.
@@ -334,9 +996,7 @@ Remember: Your goal is to help scientists make informed decisions, not to provid
         Returns:
             Final response from the agent
         """
-        # Run the synchronous version in a thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.run, user_question, verbose)
+        return await self.arun(user_question, verbose=verbose)
 
     def get_critic_prompt(self) -> str:
         """Get the system prompt for the scientific critic.
@@ -387,44 +1047,16 @@ Do NOT provide a rewritten answer - only critique and suggestions.
 
 If the answer is of high quality and scientifically sound, you may approve it with minor suggestions."""
 
-    def run_with_critic(self, user_question: str, verbose: bool = False, max_refinement_rounds: int = 1) -> tuple[str, str, str]:
-        """Run the agent with critic feedback loop.
+    def _critic_call_params(self, user_question: str, initial_answer: str) -> dict[str, Any]:
+        """Build the create_message arguments for the critic review.
 
         Args:
-            user_question: The question to answer
-            verbose: Print intermediate steps
-            max_refinement_rounds: Maximum number of refinement iterations (default: 1)
+            user_question: The original question
+            initial_answer: The answer to review
 
         Returns:
-            Tuple of (initial_answer, critique, final_answer)
+            Keyword arguments for client.create_message / acreate_message
         """
-        if verbose:
-            print(f"\n{'='*60}")
-            print(f"RUNNING WITH CRITIC FEEDBACK")
-            print(f"{'='*60}\n")
-
-        # Step 1: Get initial answer from main agent
-        if verbose:
-            print("[STEP 1: Main Agent Analysis]")
-        initial_answer = self.run(user_question, verbose=verbose)
-
-        if not initial_answer:
-            return "", "No answer produced by agent", ""
-
-        # Step 2: Get critic feedback
-        if verbose:
-            print(f"\n{'='*60}")
-            print("[STEP 2: Scientific Critic Review]")
-            print(f"{'='*60}\n")
-
-        # Create a new agent instance for the critic with the same config
-        critic_agent = BioinformaticsAgent(
-            api_key=None,  # Reuse existing credentials
-            model=self.client.model if hasattr(self.client, 'model') else "claude-sonnet-4-20250514",
-            provider="anthropic" if isinstance(self.client, AnthropicClient) else "openrouter"
-        )
-
-        # Build critic prompt
         critic_question = f"""Please review the following scientific answer for rigor, completeness, and accuracy.
 
 ORIGINAL QUESTION:
@@ -440,50 +1072,142 @@ Provide a structured critique with:
 
 If the answer is high quality and scientifically sound, you may approve it."""
 
-        # Override the critic's system prompt
-        original_get_system_prompt = critic_agent.get_system_prompt
-        critic_agent.get_system_prompt = self.get_critic_prompt
-
         # Run critic (without tools, just reasoning)
-        critique = ""
-        critic_messages = [{"role": "user", "content": critic_question}]
-
         call_params = {
-            "messages": critic_messages,
+            "messages": [{"role": "user", "content": critic_question}],
             "tools": [],  # Critic doesn't use tools
             "temperature": 0.3,  # Lower temperature for consistent evaluation
-            "max_tokens": get_max_tokens_for_model(self.client.model),
+            "max_tokens": min(get_max_tokens_for_model(self.client.model), self.CRITIC_MAX_TOKENS),
         }
 
         if isinstance(self.client, AnthropicClient):
             call_params["system"] = self.get_critic_prompt()
+        else:
+            call_params["messages"].insert(0, {"role": "system", "content": self.get_critic_prompt()})
 
-        response = self.client.create_message(**call_params)
-        critique = self.client.get_response_text(response)
+        return call_params
 
-        if verbose:
-            print(f"Critic Feedback:\n{critique}\n")
+    def _critique(self, user_question: str, initial_answer: str) -> str:
+        """Get the critic's review of an answer."""
+        response = self.client.create_message(**self._critic_call_params(user_question, initial_answer))
+        return self.client.get_response_text(response)
 
-        # Restore original system prompt
-        critic_agent.get_system_prompt = original_get_system_prompt
+    async def _acritique(self, user_question: str, initial_answer: str) -> str:
+        """Async version of _critique."""
+        response = await self.client.acreate_message(**self._critic_call_params(user_question, initial_answer))
+        return self.client.get_response_text(response)
 
-        # Step 3: Check if refinement needed
-        # Simple heuristic: if critique mentions serious issues, refine
-        needs_refinement = any(keyword in critique.lower() for keyword in [
+    @staticmethod
+    def _needs_refinement(critique: str) -> bool:
+        """Simple heuristic: refine if the critique mentions serious issues."""
+        return any(keyword in critique.lower() for keyword in [
             "error", "incorrect", "missing", "should", "needs", "improve",
             "gap", "weakness", "concern", "problem"
         ])
 
-        if not needs_refinement or max_refinement_rounds == 0:
+    def _fork(self) -> "BioinformaticsAgent":
+        """Create an agent with its own conversation that shares this agent's
+        client, tools and tool cache.
+
+        Returns:
+            Lightweight copy safe to run concurrently with this agent
+        """
+        clone = copy.copy(self)
+        clone.conversation_history = []
+        clone._tool_turns = []
+        clone._token_counts = {}
+        clone._last_assistant_text = ""
+        return clone
+
+    async def _aspeculative_review(self, user_question: str, initial_answer: str, verbose: bool = False) -> tuple[str, str]:
+        """Run the critic and a speculative refinement concurrently.
+
+        The refinement cannot see the critique (it is not written yet), so it
+        is drafted from a self-review prompt on a forked agent.
+
+        Returns:
+            Tuple of (critique, speculative_refined_answer)
+        """
+        speculative_question = f"""Critically review your previous answer below for errors, gaps, missing analyses, and unsupported claims, then provide an improved answer.
+
+ORIGINAL QUESTION:
+{user_question}
+
+YOUR PREVIOUS ANSWER:
+{initial_answer}
+
+Please provide an improved answer. Focus on fixing errors, filling gaps, and adding missing analyses."""
+
+        try:
+            critique, refined = await asyncio.gather(
+                self._acritique(user_question, initial_answer),
+                self._fork().arun(speculative_question, verbose=verbose),
+            )
+        finally:
+            await self.client.aclose()
+        return critique, refined
+
+    def run_with_critic(self, user_question: str, verbose: bool = False, max_refinement_rounds: int = 1, speculative: bool = False) -> tuple[str, str, str]:
+        """Run the agent with critic feedback loop.
+
+        Args:
+            user_question: The question to answer
+            verbose: Print intermediate steps
+            max_refinement_rounds: Maximum number of refinement iterations (default: 1)
+            speculative: Draft the refinement in parallel with the critic instead
+                of after it. Roughly halves wall time when refinement is needed,
+                but the refined answer is based on a self-review rather than
+                the critic's feedback; it is discarded if the critic approves.
+
+        Returns:
+            Tuple of (initial_answer, critique, final_answer)
+        """
+        if verbose:
+            print(_BANNER_OPEN)
+            print(f"RUNNING WITH CRITIC FEEDBACK")
+            print(_BANNER_CLOSE)
+
+        # Step 1: Get initial answer from main agent
+        if verbose:
+            print("[STEP 1: Main Agent Analysis]")
+        initial_answer = self.run(user_question, verbose=verbose)
+
+        if not initial_answer:
+            return "", "No answer produced by agent", ""
+
+        # Step 2: Get critic feedback
+        if verbose:
+            print(_BANNER_OPEN)
+            print("[STEP 2: Scientific Critic Review]")
+            print(_BANNER_CLOSE)
+
+        speculative_answer = None
+        if speculative and max_refinement_rounds > 0:
+            critique, speculative_answer = asyncio.run(
+                self._aspeculative_review(user_question, initial_answer, verbose=verbose)
+            )
+        else:
+            critique = self._critique(user_question, initial_answer)
+
+        if verbose:
+            print(f"Critic Feedback:\n{critique}\n")
+
+        # Step 3: Check if refinement needed
+        if not self._needs_refinement(critique) or max_refinement_rounds == 0:
             if verbose:
                 print("[STEP 3: No refinement needed - answer approved]\n")
             return initial_answer, critique, initial_answer
 
+        if speculative_answer is not None:
+            if verbose:
+                print("[STEP 3: Using speculatively refined answer]\n")
+            return initial_answer, critique, speculative_answer or initial_answer
+
         # Step 4: Refine answer based on critique
         if verbose:
-            print(f"\n{'='*60}")
+            print(_BANNER_OPEN)
             print("[STEP 3: Refining Answer Based on Feedback]")
-            print(f"{'='*60}\n")
+            print(_BANNER_CLOSE)
 
         refinement_question = f"""Based on the scientific critique below, please revise and improve your previous answer.
 
@@ -502,9 +1226,9 @@ Please provide an improved answer that addresses the critique's suggestions. Foc
         final_answer = self.run(refinement_question, verbose=verbose)
 
         if verbose:
-            print(f"\n{'='*60}")
+            print(_BANNER_OPEN)
             print("[COMPLETE: Answer refined based on critic feedback]")
-            print(f"{'='*60}\n")
+            print(_BANNER_CLOSE)
 
         return initial_answer, critique, final_answer
 
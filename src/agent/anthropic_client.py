@@ -1,12 +1,17 @@
 """Anthropic API client with tool calling support."""
 
+import asyncio
 import json
 import os
 from typing import Any, Optional
-import requests
+from src.agent.http_session import PooledSessionMixin
+from src.utils import json_utils
 
+# Prompt-caching marker for content blocks that repeat across requests
+_EPHEMERAL_CACHE = {"type": "ephemeral"}
 
-class AnthropicClient:
+
+class AnthropicClient(PooledSessionMixin):
     """Client for Anthropic API with tool calling support."""
 
     def __init__(self, api_key: Optional[str] = None, model: str = "claude-sonnet-4-20250514"):
@@ -28,6 +33,61 @@ class AnthropicClient:
             "content-type": "application/json",
         }
 
+        self._init_sessions()
+
+        # Last (input, cache-marked) system prompt and tool list, so repeated
+        # iterations send the same objects instead of rebuilding them. Agents
+        # sharing this client replace the pairs concurrently, so each call
+        # reads a pair once and only ever uses its own snapshot
+        self._system_blocks: tuple[Any, Any] = (None, None)
+        self._marked_tools: tuple[Any, Any] = (None, None)
+
+    def _build_payload(
+        self,
+        messages: list[dict[str, str]],
+        tools: Optional[list[dict[str, Any]]],
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+    ) -> dict[str, Any]:
+        """Build the /messages request body."""
+        # Anthropic API requires system prompt separate from messages
+        # Extract system message if present
+        system_messages = [m for m in messages if m.get("role") == "system"]
+        if system_messages:
+            if not system:
+                system = system_messages[0].get("content", "")
+            messages = [m for m in messages if m.get("role") != "system"]
+
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+        # The system prompt and tool definitions are identical on every
+        # iteration; mark them as a cacheable prefix so repeats are read from
+        # the prompt cache instead of being reprocessed
+        if system:
+            if isinstance(system, str):
+                cached_system, blocks = self._system_blocks
+                if cached_system != system:
+                    blocks = [{"type": "text", "text": system, "cache_control": _EPHEMERAL_CACHE}]
+                    self._system_blocks = (system, blocks)
+                system = blocks
+            payload["system"] = system
+
+        # Add tools if provided
+        if tools:
+            cached_tools, marked = self._marked_tools
+            if cached_tools is not tools:
+                marked = tools[:-1] + [{**tools[-1], "cache_control": _EPHEMERAL_CACHE}]
+                self._marked_tools = (tools, marked)
+            payload["tools"] = marked
+
+        return payload
+
     def create_message(
         self,
         messages: list[dict[str, str]],
@@ -48,29 +108,9 @@ class AnthropicClient:
         Returns:
             Response dict from Anthropic API
         """
-        # Anthropic API requires system prompt separate from messages
-        # Extract system message if present
-        if not system:
-            system_messages = [m for m in messages if m.get("role") == "system"]
-            if system_messages:
-                system = system_messages[0].get("content", "")
-                messages = [m for m in messages if m.get("role") != "system"]
-
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-        }
+        payload = self._build_payload(messages, tools, temperature, max_tokens, system)
 
-        if system:
-            payload["system"] = system
-
-        # Add tools if provided
-        if tools:
-            payload["tools"] = tools
-
-        response = requests.post(
+        response = self._session.post(
             f"{self.base_url}/messages",
             headers=self.headers,
             json=payload,
@@ -82,6 +122,51 @@ class AnthropicClient:
 
         return response.json()
 
+    async def acreate_message(
+        self,
+        messages: list[dict[str, str]],
+        tools: Optional[list[dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        system: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Async version of create_message.
+
+        Uses a shared aiohttp session when aiohttp is installed; otherwise the
+        blocking request runs in a worker thread.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            tools: Optional list of tool definitions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            system: System prompt
+
+        Returns:
+            Response dict from Anthropic API
+        """
+        try:
+            import aiohttp  # Optional, and slow to import; loaded on first async use
+        except ImportError:
+            return await asyncio.to_thread(
+                self.create_message, messages, tools, temperature, max_tokens, system
+            )
+
+        payload = self._build_payload(messages, tools, temperature, max_tokens, system)
+
+        session = self._get_async_session()
+        async with session.post(
+            f"{self.base_url}/messages",
+            headers=self.headers,
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=120),
+        ) as response:
+            body = await response.text()
+            if response.status != 200:
+                raise RuntimeError(f"Anthropic API error {response.status}: {body}")
+
+        return json_utils.loads(body)
+
     def extract_tool_calls(self, response: dict[str, Any]) -> list[dict[str, Any]]:
         """Extract tool calls from API response.
 
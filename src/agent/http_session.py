@@ -0,0 +1,63 @@
+"""Connection pooling shared by the HTTP API clients."""
+
+import asyncio
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class PooledSessionMixin:
+    """Keep-alive sync and async HTTP sessions for an API client.
+
+    Subclasses call ``_init_sessions()`` from ``__init__`` and then use
+    ``self._session`` for blocking requests and ``_get_async_session()``
+    from coroutines.
+    """
+
+    def _init_sessions(self):
+        """Create the pooled requests session; the aiohttp one is made lazily."""
+        # Reuse one keep-alive connection pool across iterations instead of a
+        # fresh TCP + TLS handshake per request. Completions are POSTs that
+        # are billed once processed, so only retry what was never processed:
+        # failed connections, and 429/503 rejections (after Retry-After).
+        # A 500 or a read timeout may come after the work was done.
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                connect=3,
+                read=0,
+                backoff_factor=0.5,
+                status_forcelist=[429, 503],
+                allowed_methods=frozenset({"POST"}),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            ),
+        ))
+
+        # Created lazily by _get_async_session (one per event loop)
+        self._async_session = None
+        self._async_session_loop = None
+
+    def _get_async_session(self):
+        """Return the aiohttp session for the running event loop.
+
+        The session is created lazily and reused for every request made from
+        the same loop, so agents sharing this client share its connection pool.
+        """
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session.closed or self._async_session_loop is not loop:
+            self._async_session = aiohttp.ClientSession()
+            self._async_session_loop = loop
+        return self._async_session
+
+    async def aclose(self):
+        """Close the aiohttp session, if one was opened."""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+        self._async_session_loop = None
@@ -10,6 +10,10 @@ from src.agent.team_manager import (
     create_critic_persona,
 )
 
+# Separator rule for verbose meeting output
+_RULE = "=" * 60
+_BANNER_OPEN = "\n" + _RULE
+
 
 class VirtualLabMeeting:
     """Manages a Virtual Lab research meeting with multiple specialist agents.
@@ -57,9 +61,9 @@ class VirtualLabMeeting:
 
         # Initialize the PI first
         if self.verbose:
-            print("\n" + "=" * 60)
+            print(_BANNER_OPEN)
             print("INITIALIZING VIRTUAL LAB MEETING")
-            print("=" * 60)
+            print(_RULE)
 
         self.pi = ScientificAgent(
             persona=create_pi_persona(),
@@ -108,11 +112,16 @@ class VirtualLabMeeting:
             input_dir=self.input_dir
         )
 
+        # All agents share the PI's client, so every request in the meeting goes
+        # through one keep-alive connection pool (one async session per loop)
+        for agent in [*self.specialists, self.critic]:
+            agent.client = self.pi.client
+
         self.meeting_transcript = []
 
-    def _run_specialists_parallel(self) -> List[str]:
-        """Run all specialists in parallel for efficiency.
-        
+    async def _arun_specialists(self) -> List[str]:
+        """Run all specialists concurrently on the current event loop.
+
         Returns:
             List of specialist responses in the same order as self.specialists
         """
@@ -133,24 +142,10 @@ Contribute your specialized analysis. You may:
 
 Be concise (3-5 sentences or a specific analysis). Focus on YOUR expertise."""
 
-        async def run_all():
-            """Run all specialists concurrently."""
-            tasks = [
-                agent.run_async(specialist_prompt, verbose=self.verbose)
-                for agent in self.specialists
-            ]
-            return await asyncio.gather(*tasks)
-
-        # Run the async function
-        try:
-            # Try to get the running loop (only works if already in async context)
-            loop = asyncio.get_running_loop()
-            # If we're already in an async context, create new task
-            future = asyncio.run_coroutine_threadsafe(run_all(), loop)
-            return future.result()
-        except RuntimeError:
-            # No running loop - we're in a sync context, so use asyncio.run()
-            return asyncio.run(run_all())
+        return list(await asyncio.gather(*(
+            agent.arun(specialist_prompt, verbose=self.verbose)
+            for agent in self.specialists
+        )))
 
     def run_meeting(self, num_rounds: int = 2) -> str:
         """Run the Virtual Lab meeting.
@@ -161,10 +156,33 @@ Be concise (3-5 sentences or a specific analysis). Focus on YOUR expertise."""
         Returns:
             Final synthesized answer from the PI
         """
+        return asyncio.run(self.run_meeting_async(num_rounds=num_rounds))
+
+    async def run_meeting_async(self, num_rounds: int = 2) -> str:
+        """Async version of run_meeting().
+
+        The whole meeting runs on one event loop, so the specialists of each
+        round are answered concurrently and reuse the same HTTP connections
+        across rounds.
+
+        Args:
+            num_rounds: Number of discussion rounds (default: 2)
+
+        Returns:
+            Final synthesized answer from the PI
+        """
+        try:
+            return await self._run_meeting(num_rounds)
+        finally:
+            # The async HTTP session is bound to this event loop; close it before the loop ends
+            await self.pi.client.aclose()
+
+    async def _run_meeting(self, num_rounds: int) -> str:
+        """Meeting phases for run_meeting_async()."""
         if self.verbose:
-            print("\n" + "=" * 60)
+            print(_BANNER_OPEN)
             print("STARTING MEETING")
-            print("=" * 60)
+            print(_RULE)
 
         # Phase 1: PI opens the meeting and sets the agenda
         if self.verbose:
@@ -184,7 +202,7 @@ Provide a brief opening (2-3 sentences) that:
 
 Keep it concise - this is just the opening."""
 
-        pi_intro = self.pi.run(pi_intro_prompt, verbose=self.verbose)
+        pi_intro = await self.pi.arun(pi_intro_prompt, verbose=self.verbose)
         self.meeting_transcript.append({
             "speaker": "PI",
             "role": "Opening Remarks",
@@ -194,12 +212,12 @@ Keep it concise - this is just the opening."""
         # Phase 2: Round-robin specialist discussions
         for round_num in range(num_rounds):
             if self.verbose:
-                print(f"\n{'=' * 60}")
+                print(_BANNER_OPEN)
                 print(f"[PHASE 2: DISCUSSION ROUND {round_num + 1}/{num_rounds}]")
-                print(f"{'=' * 60}")
+                print(_RULE)
 
             # Run specialists in PARALLEL for efficiency
-            specialist_responses = self._run_specialists_parallel()
+            specialist_responses = await self._arun_specialists()
             
             # Add responses to transcript
             for agent, response in zip(self.specialists, specialist_responses):
@@ -231,7 +249,7 @@ Your task:
 
 Be specific and constructive (2-4 sentences)."""
 
-            critique = self.critic.run(critique_prompt, verbose=False)  # Critic doesn't need verbose
+            critique = await self.critic.arun(critique_prompt, verbose=False)  # Critic doesn't need verbose
             self.meeting_transcript.append({
                 "speaker": "Critic",
                 "role": "Quality Review",
@@ -258,7 +276,7 @@ Provide a brief synthesis (2-3 sentences):
 
 Be concise - this is an interim summary."""
 
-                round_summary = self.pi.run(synthesis_prompt, verbose=False)
+                round_summary = await self.pi.arun(synthesis_prompt, verbose=False)
                 self.meeting_transcript.append({
                     "speaker": "PI",
                     "role": f"Round {round_num + 1} Synthesis",
@@ -270,9 +288,9 @@ Be concise - this is an interim summary."""
 
         # Phase 4: PI final synthesis
         if self.verbose:
-            print("\n" + "=" * 60)
+            print(_BANNER_OPEN)
             print("[PHASE 3: FINAL SYNTHESIS]")
-            print("=" * 60)
+            print(_RULE)
 
         final_prompt = f"""Synthesize the team's findings into a final answer.
 
@@ -294,7 +312,7 @@ away the source attribution.
 
 Structure your answer clearly with sections if needed."""
 
-        final_answer = self.pi.run(final_prompt, verbose=self.verbose)
+        final_answer = await self.pi.arun(final_prompt, verbose=self.verbose)
         self.meeting_transcript.append({
             "speaker": "PI",
             "role": "Final Answer",
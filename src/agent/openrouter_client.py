@@ -1,9 +1,11 @@
 """OpenRouter API client with tool calling support."""
 
+import asyncio
 import json
 import os
 from typing import Any, Optional
-import requests
+from src.agent.http_session import PooledSessionMixin
+from src.utils import json_utils
 
 
 class OpenRouterPrivacyError(RuntimeError):
@@ -15,7 +17,7 @@ class OpenRouterPrivacyError(RuntimeError):
     pass
 
 
-class OpenRouterClient:
+class OpenRouterClient(PooledSessionMixin):
     """Client for OpenRouter API with tool calling support."""
 
     def __init__(self, api_key: Optional[str] = None, model: str = "anthropic/claude-sonnet-4"):
@@ -48,6 +50,96 @@ class OpenRouterClient:
             # Free models require allowing data to be published
             self.headers["OpenRouter-Data-Policy"] = "allow-all"
 
+        self._init_sessions()
+
+    def _build_payload(
+        self,
+        messages: list[dict[str, str]],
+        tools: Optional[list[dict[str, Any]]],
+        temperature: float,
+        max_tokens: int,
+        top_p: float,
+    ) -> dict[str, Any]:
+        """Build the chat/completions request body."""
+        # Anthropic models behind OpenRouter only cache prompts that carry an
+        # explicit cache_control marker (other providers cache automatically),
+        # so mark the system prompt, which is re-sent unchanged every iteration
+        if self.model.startswith("anthropic/"):
+            messages = [self._cacheable_system_message(m) if m.get("role") == "system" else m for m in messages]
+
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "top_p": top_p,
+        }
+
+        # For free models, explicitly allow data publication
+        if ":free" in self.model.lower():
+            payload["allow_fallback"] = True
+
+        # Add tools if provided
+        if tools:
+            payload["tools"] = tools
+
+        return payload
+
+    @staticmethod
+    def _cacheable_system_message(message: dict[str, Any]) -> dict[str, Any]:
+        """Return a system message whose text carries a cache_control marker."""
+        content = message.get("content")
+        if not isinstance(content, str):
+            return message
+        return {
+            **message,
+            "content": [{"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}],
+        }
+
+    @staticmethod
+    def _extract_error_message(body_text: str) -> str:
+        """Extract an error message from a JSON or plain-text error body."""
+        try:
+            body = json.loads(body_text)
+            # body may be {"error": {"message": "..."}} or similar
+            if isinstance(body, dict):
+                return body.get("error", {}).get("message") or body.get("message") or str(body)
+            return str(body)
+        except Exception:
+            # Fallback to raw text
+            return body_text or ""
+
+    @staticmethod
+    def _is_privacy_error(status_code: int, err_msg: str) -> bool:
+        """Detect the data-policy error OpenRouter returns for free models."""
+        err_lower = (err_msg or "").lower()
+
+        # Broad keyword matching to catch variations of the privacy error
+        privacy_signals = [
+            "no endpoints found",
+            "data policy",
+            "free model publication",
+            "publication",
+            "data privacy",
+            "matching your data policy",
+        ]
+
+        return status_code in (403, 404) and any(sig in err_lower for sig in privacy_signals)
+
+    def _enable_data_publication(self, payload: dict[str, Any]):
+        """Set the data-policy header and payload flag before a retry."""
+        self.headers["OpenRouter-Data-Policy"] = "allow-all"
+        payload["allow_fallback"] = True
+
+    @staticmethod
+    def _privacy_error(first_status: int, first_msg: str, retry_status: int, retry_text: str) -> OpenRouterPrivacyError:
+        """Build the actionable error raised when the privacy retry also fails."""
+        return OpenRouterPrivacyError(
+            "OpenRouter API error: No endpoints found matching your data policy even after adding the data-policy header. "
+            "Please enable 'Free model publication' at https://openrouter.ai/settings/privacy or choose a non-free model. "
+            f"(server responses: first_status={first_status}, first_body={first_msg!r}, retry_status={retry_status}, retry_body={retry_text})"
+        )
+
     def create_message(
         self,
         messages: list[dict[str, str]],
@@ -68,23 +160,9 @@ class OpenRouterClient:
         Returns:
             Response dict from OpenRouter API
         """
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "top_p": top_p,
-        }
-
-        # For free models, explicitly allow data publication
-        if ":free" in self.model.lower():
-            payload["allow_fallback"] = True
+        payload = self._build_payload(messages, tools, temperature, max_tokens, top_p)
 
-        # Add tools if provided
-        if tools:
-            payload["tools"] = tools
-
-        response = requests.post(
+        response = self._session.post(
             f"{self.base_url}/chat/completions",
             headers=self.headers,
             json=payload,
@@ -93,40 +171,16 @@ class OpenRouterClient:
         # If we get a non-200 response, try to detect the privacy/data-policy error
         # that OpenRouter returns for free models when data publication is not enabled.
         if response.status_code != 200:
-            # Try to extract an error message from JSON body or plain text
-            err_msg = None
-            try:
-                body = response.json()
-                # body may be {"error": {"message": "..."}} or similar
-                if isinstance(body, dict):
-                    err_msg = body.get("error", {}).get("message") or body.get("message") or str(body)
-                else:
-                    err_msg = str(body)
-            except Exception:
-                # Fallback to raw text
-                err_msg = response.text or ""
-
-            err_lower = (err_msg or "").lower()
-
-            # Broad keyword matching to catch variations of the privacy error
-            privacy_signals = [
-                "no endpoints found",
-                "data policy",
-                "free model publication",
-                "publication",
-                "data privacy",
-                "matching your data policy",
-            ]
-
-            if response.status_code in (403, 404) and any(sig in err_lower for sig in privacy_signals):
+            err_msg = self._extract_error_message(response.text)
+
+            if self._is_privacy_error(response.status_code, err_msg):
                 # Attempt an automatic retry with the data-policy header and payload flag.
                 # This fixes the root cause in many cases where the user simply needs
                 # to allow free-model data publication. We set the header locally and
                 # resend the request once.
-                self.headers["OpenRouter-Data-Policy"] = "allow-all"
-                payload["allow_fallback"] = True
+                self._enable_data_publication(payload)
 
-                retry_resp = requests.post(
+                retry_resp = self._session.post(
                     f"{self.base_url}/chat/completions",
                     headers=self.headers,
                     json=payload,
@@ -137,17 +191,118 @@ class OpenRouterClient:
                     return retry_resp.json()
 
                 # If retry also failed, raise a clear, actionable error
-                raise OpenRouterPrivacyError(
-                    "OpenRouter API error: No endpoints found matching your data policy even after adding the data-policy header. "
-                    "Please enable 'Free model publication' at https://openrouter.ai/settings/privacy or choose a non-free model. "
-                    f"(server responses: first_status={response.status_code}, first_body={err_msg!r}, retry_status={retry_resp.status_code}, retry_body={retry_resp.text})"
-                )
+                raise self._privacy_error(response.status_code, err_msg, retry_resp.status_code, retry_resp.text)
 
             # Fallback generic error for other status codes
             raise RuntimeError(f"OpenRouter API error {response.status_code}: {response.text}")
 
         return response.json()
 
+    async def _apost(self, payload: dict[str, Any]) -> tuple[int, str]:
+        """POST a chat/completions request and return (status, body text)."""
+        import aiohttp
+
+        session = self._get_async_session()
+        async with session.post(
+            f"{self.base_url}/chat/completions",
+            headers=self.headers,
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=120),
+        ) as response:
+            return response.status, await response.text()
+
+    async def acreate_message(
+        self,
+        messages: list[dict[str, str]],
+        tools: Optional[list[dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        top_p: float = 1.0,
+    ) -> dict[str, Any]:
+        """Async version of create_message.
+
+        Uses a shared aiohttp session when aiohttp is installed; otherwise the
+        blocking request runs in a worker thread.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            tools: Optional list of tool definitions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            top_p: Nucleus sampling parameter
+
+        Returns:
+            Response dict from OpenRouter API
+        """
+        try:
+            import aiohttp  # Optional, and slow to import; loaded on first async use
+        except ImportError:
+            return await asyncio.to_thread(
+                self.create_message, messages, tools, temperature, max_tokens, top_p
+            )
+
+        payload = self._build_payload(messages, tools, temperature, max_tokens, top_p)
+
+        status, body = await self._apost(payload)
+        if status != 200:
+            err_msg = self._extract_error_message(body)
+
+            if self._is_privacy_error(status, err_msg):
+                self._enable_data_publication(payload)
+
+                retry_status, retry_body = await self._apost(payload)
+                if retry_status == 200:
+                    return json_utils.loads(retry_body)
+
+                raise self._privacy_error(status, err_msg, retry_status, retry_body)
+
+            raise RuntimeError(f"OpenRouter API error {status}: {body}")
+
+        return json_utils.loads(body)
+
+    @staticmethod
+    def _parse_tool_call(call: dict[str, Any], index: int) -> dict[str, Any]:
+        """Convert one OpenAI-format tool call into a 'id'/'name'/'input' dict.
+
+        Malformed calls are kept, with an 'error' entry, so that they are
+        answered with an error result under their id instead of vanishing
+        from the turn.
+
+        Args:
+            call: Tool call from the response message or the stream
+            index: Position of the call in the response's tool_calls
+
+        Returns:
+            Parsed tool call with 'id', 'name', 'input' and 'index'
+        """
+        func = call.get("function", {})
+        tool_name = func.get("name", "")
+        parsed = {
+            "id": call.get("id", ""),
+            "name": tool_name,
+            "input": {},
+            "index": index,
+        }
+
+        if call.get("type") != "function":
+            parsed["error"] = f"Unsupported tool call type: {call.get('type')!r}"
+            return parsed
+
+        try:
+            arguments = json_utils.loads(func.get("arguments") or "{}")
+        except json.JSONDecodeError as e:
+            parsed["error"] = f"Malformed arguments for {tool_name}: {e}"
+            return parsed
+        if not isinstance(arguments, dict):
+            parsed["error"] = f"Arguments for {tool_name} must be a JSON object"
+            return parsed
+
+        parsed["input"] = arguments
+        # Validate arguments are not empty for functions that require parameters
+        if tool_name == "execute_python" and not arguments.get("code"):
+            parsed["error"] = "execute_python requires a non-empty 'code' argument"
+        return parsed
+
     def extract_tool_calls(self, response: dict[str, Any]) -> list[dict[str, Any]]:
         """Extract tool calls from API response.
 
@@ -165,31 +320,137 @@ class OpenRouterClient:
         message = response["choices"][0].get("message", {})
 
         # Handle tool_calls field (standard OpenAI format)
-        if "tool_calls" in message:
-            for call in message["tool_calls"]:
-                if call.get("type") == "function":
-                    func = call.get("function", {})
-                    arguments_str = func.get("arguments", "{}")
-
-                    try:
-                        arguments = json.loads(arguments_str)
-                    except json.JSONDecodeError:
-                        # Skip malformed tool calls
+        for index, call in enumerate(message.get("tool_calls") or []):
+            tool_calls.append(self._parse_tool_call(call, index))
+
+        return tool_calls
+
+    def stream_message(
+        self,
+        messages: list[dict[str, str]],
+        tools: Optional[list[dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        top_p: float = 1.0,
+    ):
+        """Stream a message from OpenRouter, yielding tool calls as they complete.
+
+        Yields ("tool_call", tool_call) as soon as each tool call's arguments
+        are fully received, then ("response", response) with the assembled
+        response in the same shape create_message returns.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            tools: Optional list of tool definitions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            top_p: Nucleus sampling parameter
+        """
+        payload = self._build_payload(messages, tools, temperature, max_tokens, top_p)
+        payload["stream"] = True
+
+        for attempt in range(2):
+            with self._session.post(
+                f"{self.base_url}/chat/completions",
+                headers={**self.headers, "Accept": "text/event-stream"},
+                json=payload,
+                timeout=120,
+                stream=True,
+            ) as response:
+                if response.status_code != 200:
+                    err_msg = self._extract_error_message(response.text)
+                    if attempt == 0 and self._is_privacy_error(response.status_code, err_msg):
+                        first_status, first_msg = response.status_code, err_msg
+                        self._enable_data_publication(payload)
+                        continue
+                    if attempt == 1:
+                        raise self._privacy_error(first_status, first_msg, response.status_code, response.text)
+                    raise RuntimeError(f"OpenRouter API error {response.status_code}: {response.text}")
+
+                accumulator = _StreamAccumulator()
+                for raw_line in response.iter_lines():
+                    chunk = _parse_sse_line(raw_line)
+                    if chunk is None:
                         continue
+                    for index, call in accumulator.feed(chunk):
+                        yield "tool_call", self._parse_tool_call(call, index)
+
+                for index, call in accumulator.finish():
+                    yield "tool_call", self._parse_tool_call(call, index)
+
+                yield "response", accumulator.to_response()
+                return
 
-                    # Validate arguments are not empty for functions that require parameters
-                    tool_name = func.get("name", "")
-                    if tool_name == "execute_python" and not arguments.get("code"):
-                        # Skip execute_python calls without code parameter
+    async def astream_message(
+        self,
+        messages: list[dict[str, str]],
+        tools: Optional[list[dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        top_p: float = 1.0,
+    ):
+        """Stream a message from OpenRouter, yielding tool calls as they complete.
+
+        Yields ("tool_call", tool_call) as soon as each tool call's arguments
+        are fully received, so callers can start executing it while the model
+        is still decoding, then ("response", response) with the assembled
+        response in the same shape create_message returns.
+
+        Without aiohttp, falls back to a non-streamed request in a worker thread.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            tools: Optional list of tool definitions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            top_p: Nucleus sampling parameter
+        """
+        try:
+            import aiohttp  # Optional, and slow to import; loaded on first async use
+        except ImportError:
+            response = await asyncio.to_thread(
+                self.create_message, messages, tools, temperature, max_tokens, top_p
+            )
+            for tool_call in self.extract_tool_calls(response):
+                yield "tool_call", tool_call
+            yield "response", response
+            return
+
+        payload = self._build_payload(messages, tools, temperature, max_tokens, top_p)
+        payload["stream"] = True
+
+        session = self._get_async_session()
+        for attempt in range(2):
+            async with session.post(
+                f"{self.base_url}/chat/completions",
+                headers={**self.headers, "Accept": "text/event-stream"},
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=120),
+            ) as response:
+                if response.status != 200:
+                    body = await response.text()
+                    err_msg = self._extract_error_message(body)
+                    if attempt == 0 and self._is_privacy_error(response.status, err_msg):
+                        first_status, first_msg = response.status, err_msg
+                        self._enable_data_publication(payload)
                         continue
+                    if attempt == 1:
+                        raise self._privacy_error(first_status, first_msg, response.status, body)
+                    raise RuntimeError(f"OpenRouter API error {response.status}: {body}")
+
+                accumulator = _StreamAccumulator()
+                async for raw_line in response.content:
+                    chunk = _parse_sse_line(raw_line)
+                    if chunk is None:
+                        continue
+                    for index, call in accumulator.feed(chunk):
+                        yield "tool_call", self._parse_tool_call(call, index)
 
-                    tool_calls.append({
-                        "id": call.get("id", ""),
-                        "name": tool_name,
-                        "input": arguments
-                    })
+                for index, call in accumulator.finish():
+                    yield "tool_call", self._parse_tool_call(call, index)
 
-        return tool_calls
+                yield "response", accumulator.to_response()
+                return
 
     def get_response_text(self, response: dict[str, Any]) -> str:
         """Extract text content from API response.
@@ -205,3 +466,115 @@ class OpenRouterClient:
 
         message = response["choices"][0].get("message", {})
         return message.get("content", "")
+
+
+def _parse_sse_line(raw_line: bytes) -> Optional[dict[str, Any]]:
+    """Parse one server-sent-events line into a chunk dict.
+
+    Returns:
+        The decoded chunk, or None for comments, blank lines and [DONE]
+    """
+    line = raw_line.decode("utf-8").strip()
+    if not line.startswith("data:"):
+        # Blank separators and ": OPENROUTER PROCESSING" keep-alive comments
+        return None
+
+    data = line[len("data:"):].strip()
+    if data == "[DONE]":
+        return None
+
+    chunk = json_utils.loads(data)
+    if "error" in chunk:
+        error = chunk["error"]
+        message = error.get("message") if isinstance(error, dict) else error
+        raise RuntimeError(f"OpenRouter stream error: {message}")
+    return chunk
+
+
+class _StreamAccumulator:
+    """Reassembles streamed chat/completions deltas into a full response.
+
+    Tool call arguments arrive as string fragments keyed by index, and
+    fragments of different calls may interleave. A call is complete once its
+    arguments parse as JSON, or when the stream ends.
+    """
+
+    def __init__(self):
+        self.content_parts: list[str] = []
+        self.tool_calls: dict[int, dict[str, Any]] = {}
+        self.emitted: set[int] = set()
+        self.finish_reason: Optional[str] = None
+
+    def feed(self, chunk: dict[str, Any]) -> list[tuple[int, dict[str, Any]]]:
+        """Add one streamed chunk.
+
+        Returns:
+            (index, OpenAI-format tool call) pairs that became complete with
+            this chunk
+        """
+        completed = []
+        for choice in chunk.get("choices", []):
+            delta = choice.get("delta") or {}
+            if delta.get("content"):
+                self.content_parts.append(delta["content"])
+
+            for fragment in delta.get("tool_calls") or []:
+                index = fragment.get("index", len(self.tool_calls))
+                call = self.tool_calls.setdefault(index, {
+                    "id": "",
+                    "type": "function",
+                    "function": {"name": "", "arguments": ""},
+                })
+                if fragment.get("id"):
+                    call["id"] = fragment["id"]
+                if fragment.get("type"):
+                    call["type"] = fragment["type"]
+                func = fragment.get("function") or {}
+                if func.get("name"):
+                    call["function"]["name"] += func["name"]
+                if func.get("arguments"):
+                    call["function"]["arguments"] += func["arguments"]
+                    # A later index starting proves nothing: its fragments
+                    # may interleave with the rest of this call's arguments
+                    if index not in self.emitted and self._arguments_complete(call):
+                        completed.append(self._emit(index))
+
+            if choice.get("finish_reason"):
+                self.finish_reason = choice["finish_reason"]
+
+        return completed
+
+    def finish(self) -> list[tuple[int, dict[str, Any]]]:
+        """Mark the stream as ended.
+
+        Returns:
+            (index, tool call) pairs that had not been emitted yet
+        """
+        return [self._emit(i) for i in sorted(self.tool_calls) if i not in self.emitted]
+
+    def to_response(self) -> dict[str, Any]:
+        """Build a response dict shaped like a non-streamed completion.
+
+        Tool calls are listed in index order; stream indices number the calls
+        from 0, so a call's index is also its position in the message.
+        """
+        message: dict[str, Any] = {"role": "assistant", "content": "".join(self.content_parts)}
+        if self.tool_calls:
+            message["tool_calls"] = [self.tool_calls[i] for i in sorted(self.tool_calls)]
+        return {"choices": [{"message": message, "finish_reason": self.finish_reason}]}
+
+    def _emit(self, index: int) -> tuple[int, dict[str, Any]]:
+        self.emitted.add(index)
+        return index, self.tool_calls[index]
+
+    @staticmethod
+    def _arguments_complete(call: dict[str, Any]) -> bool:
+        arguments = call["function"]["arguments"]
+        # Only attempt a parse when the object could have just closed
+        if not arguments.rstrip().endswith("}"):
+            return False
+        try:
+            json_utils.loads(arguments)
+        except json.JSONDecodeError:
+            return False
+        return True
@@ -1,10 +1,13 @@
 """Command-line interface for the bioinformatics agent."""
 
 import argparse
+import itertools
+import logging
 import os
 import sys
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 from dotenv import load_dotenv
 
 # Load .env early so environment variables (OPENROUTER_API_KEY, etc.) are
@@ -13,7 +16,7 @@ load_dotenv()
 
 from src.agent.agent import create_agent
 from src.agent.meeting import run_virtual_lab
-from src.virtuallab_workflow.workflow import run_consensus_workflow, run_research_workflow
+# src.virtuallab_workflow pulls in LangGraph; it is imported only by the modes that use it
 
 
 def save_answer_to_file(answer: str, question: str, output_path: str = None, mode: str = "single") -> str:
@@ -68,6 +71,189 @@ def save_answer_to_file(answer: str, question: str, output_path: str = None, mod
     return str(output_file.absolute())
 
 
+# Response fields cached for --with-critic runs, in run_with_critic order
+_CRITIC_FIELDS = ("initial", "critique", "final")
+
+
+def _open_semantic_cache(args):
+    """Open the semantic response cache for single-agent modes.
+
+    Args:
+        args: Parsed CLI arguments
+
+    Returns:
+        SemanticCache, or None when disabled or unavailable
+    """
+    if args.no_cache or args.virtual_lab or args.combined or args.langgraph:
+        return None
+
+    from src.utils.semantic_cache import SemanticCache
+
+    if not SemanticCache.is_available():
+        print("Semantic cache disabled: sentence-transformers is not installed (use --no-cache to silence)", file=sys.stderr)
+        return None
+
+    try:
+        cache = SemanticCache(threshold=args.cache_threshold)
+    except Exception as e:
+        # e.g. the cache directory is read-only or the SQLite file is corrupt
+        print(f"Semantic cache disabled: open failed ({type(e).__name__}: {e})", file=sys.stderr)
+        return None
+    cache.warm_up()
+    return cache
+
+
+def _close_semantic_cache(cache):
+    """Close the semantic cache, warning instead of failing the run."""
+    if cache is None:
+        return
+    try:
+        cache.close()
+    except Exception as e:
+        _cache_failed(cache, "close", e)
+
+
+def _cache_scope(args, mode: str) -> str:
+    """Cache partition for a run: answers are only reused for the same mode,
+    model and input data."""
+    return f"{mode}|{args.model}|{Path(args.input_dir).resolve()}"
+
+
+def _cache_failed(cache, action: str, error: Exception):
+    """Warn about a semantic cache error and stop using the cache this run.
+
+    The agent's answer never depends on the cache, so an unavailable
+    embedding model or a locked database only costs the reuse.
+    """
+    print(f"Semantic cache disabled: {action} failed ({type(error).__name__}: {error})", file=sys.stderr)
+    cache.enabled = False
+
+
+def _cached_answer(cache, scope: str, question: str, compute, answer_field: str) -> dict:
+    """Return a cached response for question, or compute and cache it.
+
+    Only responses with a non-empty answer are stored, so a failed run is
+    retried next time instead of being replayed from the cache.
+
+    Args:
+        cache: SemanticCache or None
+        scope: Cache partition from _cache_scope
+        question: The user question
+        compute: Callable producing the response fields as a dict
+        answer_field: Field holding the answer that is shown and saved
+
+    Returns:
+        Response fields
+    """
+    if cache is not None and cache.enabled:
+        try:
+            hit = cache.lookup(question, scope)
+        except Exception as e:
+            _cache_failed(cache, "lookup", e)
+            hit = None
+        if hit is not None:
+            payload, similarity = hit
+            print(f"\n[Semantic cache hit (similarity {similarity:.2f}) - reusing a previous answer]")
+            return payload
+
+    payload = compute()
+    if cache is not None and cache.enabled and payload.get(answer_field):
+        try:
+            cache.store(question, scope, payload)
+        except Exception as e:
+            _cache_failed(cache, "store", e)
+    return payload
+
+
+# Piped interactive input is read (and embedded for the cache) this many lines at a time
+_QUESTION_BATCH_SIZE = 8
+_PROMPT = "Question: "
+_EXIT_WORDS: frozenset[str] = frozenset({"exit", "quit"})
+
+
+def _read_questions(cache):
+    """Yield interactive questions from stdin, stripped.
+
+    At a terminal each question is prompted for. Piped input is read in
+    batches whose embeddings are computed in one encoder pass up front.
+
+    Args:
+        cache: SemanticCache or None
+    """
+    if sys.stdin.isatty():
+        while True:
+            try:
+                yield input(_PROMPT).strip()
+            except EOFError:
+                return
+
+    while True:
+        batch = [line.strip() for line in itertools.islice(sys.stdin, _QUESTION_BATCH_SIZE)]
+        if not batch:
+            return
+        if cache is not None and cache.enabled:
+            try:
+                cache.prefetch([q for q in batch if q], batch_size=_QUESTION_BATCH_SIZE)
+            except Exception as e:
+                _cache_failed(cache, "prefetch", e)
+        for question in batch:
+            print(_PROMPT + question)
+            yield question
+
+
+def _print_cache_stats(cache):
+    """Print semantic cache counters."""
+    if cache is None:
+        print("\nSemantic cache: disabled")
+        return
+    stats = cache.stats()
+    print(f"\nSemantic cache: {stats['hits']} hits, {stats['misses']} misses "
+          f"(hit rate {stats['hit_rate']:.0%}), {stats['entries']} entries")
+
+
+# Section layouts, formatted once per section instead of rebuilding rules
+_SEP = "=" * 60
+_SECTION_TEMPLATE = f"\n{_SEP}\n{{title}}\n{_SEP}\n"
+_SECTION_BODY_TEMPLATE = _SECTION_TEMPLATE + "{body}\n"
+_CLOSED_SECTION_TEMPLATE = _SECTION_BODY_TEMPLATE + _SEP + "\n"
+_CRITIC_TEMPLATE = (
+    f"\n{_SEP}\nINITIAL ANSWER:\n{_SEP}\n{{initial}}\n"
+    f"\n{_SEP}\nCRITIC FEEDBACK:\n{_SEP}\n{{critique}}\n"
+    f"\n{_SEP}\nFINAL REFINED ANSWER:\n{_SEP}\n{{final}}\n"
+)
+
+
+def _print_section(title: str, body: Optional[str] = None, close: bool = False):
+    """Print a ruled section header (and body) with a single write, then flush.
+
+    stdout is block-buffered in main(), so output reaches the terminal at
+    section boundaries rather than line by line.
+
+    Args:
+        title: Section title
+        body: Optional text printed under the header
+        close: Draw a closing rule after the body
+    """
+    if body is None:
+        text = _SECTION_TEMPLATE.format(title=title)
+    elif close:
+        text = _CLOSED_SECTION_TEMPLATE.format(title=title, body=body)
+    else:
+        text = _SECTION_BODY_TEMPLATE.format(title=title, body=body)
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def _print_critic_answer(result: dict):
+    """Print the initial answer, critique and refined answer in one write.
+
+    Args:
+        result: Mapping with the _CRITIC_FIELDS keys
+    """
+    sys.stdout.write(_CRITIC_TEMPLATE.format(**result))
+    sys.stdout.flush()
+
+
 def main():
     """Main CLI entry point."""
 
@@ -102,6 +288,10 @@ Examples:
 
   # Verbose output to see tool calls
   python -m src.cli --question "..." --verbose
+
+  # Bypass the semantic answer cache, or show its hit/miss counters
+  python -m src.cli --question "..." --no-cache
+  python -m src.cli --question "..." --cache-stats
         """,
     )
 
@@ -190,9 +380,38 @@ Examples:
         type=str,
         help="Save the final answer to a file (supports .md, .txt). Auto-generates filename if not specified.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the semantic answer cache (single agent and --with-critic modes)",
+    )
+    parser.add_argument(
+        "--cache-threshold",
+        type=float,
+        default=0.90,
+        help="Cosine similarity needed to reuse a cached answer (default: 0.90)",
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Print semantic cache hit/miss counters",
+    )
 
     args = parser.parse_args()
 
+    # Block-buffer stdout (it is line-buffered on a terminal); sections flush
+    # explicitly and input() flushes before each prompt. --verbose keeps line
+    # buffering so progress stays visible while a long tool call runs
+    if hasattr(sys.stdout, "reconfigure") and not args.verbose:
+        sys.stdout.reconfigure(line_buffering=False)
+
+    # Tool diagnostics go through the "coscientist" logger; LOG_LEVEL=DEBUG shows them
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "WARNING").upper(),
+        format="[%(levelname)s] %(message)s",
+        stream=sys.stderr,
+    )
+
     # Set default input directory if not specified
     if args.input_dir is None:
         args.input_dir = args.data_dir
@@ -211,6 +430,10 @@ Examples:
     else:
         provider = "anthropic"
 
+    # Opened before the agent so the embedding model loads in the background
+    # while the agent is set up
+    cache = _open_semantic_cache(args)
+
     # Only create agent for non-virtual-lab modes
     if not args.virtual_lab:
         try:
@@ -229,11 +452,9 @@ Examples:
         # Single question mode
         if args.combined:
             # Combined Mode (LangGraph + Consensus)
-            print("\n" + "=" * 60)
-            print("COMBINED MODE (LangGraph + Consensus)")
-            print("=" * 60)
-            print(f"Question: {args.question}")
-            print("=" * 60)
+            _print_section("COMBINED MODE (LangGraph + Consensus)", f"Question: {args.question}", close=True)
+
+            from src.virtuallab_workflow.workflow import run_consensus_workflow
 
             result = run_consensus_workflow(
                 question=args.question,
@@ -245,21 +466,16 @@ Examples:
             
             final_answer = result.get("final_answer", "No answer generated")
             
-            print("\n" + "=" * 60)
-            print("FINAL ANSWER:")
-            print("=" * 60)
-            print(final_answer)
+            _print_section("FINAL ANSWER:", final_answer)
             
             output_file = save_answer_to_file(final_answer, args.question, args.output, mode="combined")
             print(f"\n✓ Answer saved to: {output_file}")
 
         elif args.langgraph:
             # LangGraph Mode (Standard)
-            print("\n" + "=" * 60)
-            print("LANGGRAPH MODE")
-            print("=" * 60)
-            print(f"Question: {args.question}")
-            print("=" * 60)
+            _print_section("LANGGRAPH MODE", f"Question: {args.question}", close=True)
+
+            from src.virtuallab_workflow.workflow import run_research_workflow
 
             result = run_research_workflow(
                 question=args.question,
@@ -270,22 +486,17 @@ Examples:
             
             final_answer = result.get("final_answer", "No answer generated")
             
-            print("\n" + "=" * 60)
-            print("FINAL ANSWER:")
-            print("=" * 60)
-            print(final_answer)
+            _print_section("FINAL ANSWER:", final_answer)
             
             output_file = save_answer_to_file(final_answer, args.question, args.output, mode="langgraph")
             print(f"\n✓ Answer saved to: {output_file}")
 
         elif args.virtual_lab:
             # Virtual Lab mode - multi-agent collaboration
-            print("\n" + "=" * 60)
-            print("VIRTUAL LAB MODE")
-            print("=" * 60)
-            print(f"Question: {args.question}")
-            print(f"Configuration: {args.rounds} rounds, max {args.team_size} specialists")
-            print("=" * 60)
+            _print_section("VIRTUAL LAB MODE", (
+                f"Question: {args.question}\n"
+                f"Configuration: {args.rounds} rounds, max {args.team_size} specialists"
+            ), close=True)
 
             final_answer = run_virtual_lab(
                 question=args.question,
@@ -299,39 +510,30 @@ Examples:
                 input_dir=args.input_dir
             )
 
-            print("\n" + "=" * 60)
-            print("FINAL ANSWER (PI Synthesis):")
-            print("=" * 60)
-            print(final_answer)
+            _print_section("FINAL ANSWER (PI Synthesis):", final_answer)
 
             # Save to file
             output_file = save_answer_to_file(final_answer, args.question, args.output, mode="virtual-lab")
             print(f"\n✓ Answer saved to: {output_file}")
 
         elif args.with_critic:
-            initial, critique, final = agent.run_with_critic(args.question, verbose=args.verbose)
-            print("\n" + "=" * 60)
-            print("INITIAL ANSWER:")
-            print("=" * 60)
-            print(initial)
-            print("\n" + "=" * 60)
-            print("CRITIC FEEDBACK:")
-            print("=" * 60)
-            print(critique)
-            print("\n" + "=" * 60)
-            print("FINAL REFINED ANSWER:")
-            print("=" * 60)
-            print(final)
+            result = _cached_answer(
+                cache, _cache_scope(args, "with-critic"), args.question,
+                lambda: dict(zip(_CRITIC_FIELDS, agent.run_with_critic(args.question, verbose=args.verbose))),
+                answer_field="final",
+            )
+            _print_critic_answer(result)
 
             # Save to file (save the final refined answer)
-            output_file = save_answer_to_file(final, args.question, args.output, mode="with-critic")
+            output_file = save_answer_to_file(result["final"], args.question, args.output, mode="with-critic")
             print(f"\n✓ Answer saved to: {output_file}")
         else:
-            response = agent.run(args.question, verbose=args.verbose)
-            print("\n" + "=" * 60)
-            print("Final Answer:")
-            print("=" * 60)
-            print(response)
+            response = _cached_answer(
+                cache, _cache_scope(args, "single-agent"), args.question,
+                lambda: {"response": agent.run(args.question, verbose=args.verbose)},
+                answer_field="response",
+            )["response"]
+            _print_section("Final Answer:", response)
 
             # Save to file
             output_file = save_answer_to_file(response, args.question, args.output, mode="single-agent")
@@ -339,20 +541,15 @@ Examples:
 
     elif args.interactive:
         # Interactive mode
-        print("=" * 60)
-        print("CoScientist: Interactive Mode")
-        if args.virtual_lab:
-            print("(Virtual Lab - Multi-Agent Collaboration)")
-        print("=" * 60)
-        print("Ask biomedical research questions. Type 'exit' or 'quit' to exit.\n")
-
-        while True:
-            try:
-                question = input("Question: ").strip()
-            except EOFError:
-                break
-
-            if question.lower() in ["exit", "quit"]:
+        mode_line = "\n(Virtual Lab - Multi-Agent Collaboration)" if args.virtual_lab else ""
+        print(
+            f"{_SEP}\nCoScientist: Interactive Mode{mode_line}\n{_SEP}\n"
+            "Ask biomedical research questions. Type 'exit' or 'quit' to exit.\n",
+            flush=True,
+        )
+
+        for question in _read_questions(cache):
+            if question.casefold() in _EXIT_WORDS:
                 print("Goodbye!")
                 break
 
@@ -361,9 +558,7 @@ Examples:
 
             if args.virtual_lab:
                 # Virtual Lab mode in interactive
-                print("\n" + "=" * 60)
-                print("VIRTUAL LAB MEETING")
-                print("=" * 60)
+                _print_section("VIRTUAL LAB MEETING")
 
                 final_answer = run_virtual_lab(
                     question=question,
@@ -377,10 +572,7 @@ Examples:
                     input_dir=args.input_dir
                 )
 
-                print("\n" + "=" * 60)
-                print("FINAL ANSWER:")
-                print("=" * 60)
-                print(final_answer)
+                _print_section("FINAL ANSWER:", final_answer)
 
                 # Auto-save in interactive mode with timestamp
                 output_file = save_answer_to_file(final_answer, question, mode="virtual-lab")
@@ -388,40 +580,38 @@ Examples:
                 print()
 
             elif args.with_critic:
-                initial, critique, final = agent.run_with_critic(question, verbose=args.verbose)
-                print("\n" + "=" * 60)
-                print("INITIAL ANSWER:")
-                print("=" * 60)
-                print(initial)
-                print("\n" + "=" * 60)
-                print("CRITIC FEEDBACK:")
-                print("=" * 60)
-                print(critique)
-                print("\n" + "=" * 60)
-                print("FINAL REFINED ANSWER:")
-                print("=" * 60)
-                print(final)
+                result = _cached_answer(
+                    cache, _cache_scope(args, "with-critic"), question,
+                    lambda: dict(zip(_CRITIC_FIELDS, agent.run_with_critic(question, verbose=args.verbose))),
+                    answer_field="final",
+                )
+                _print_critic_answer(result)
 
                 # Auto-save in interactive mode
-                output_file = save_answer_to_file(final, question, mode="with-critic")
+                output_file = save_answer_to_file(result["final"], question, mode="with-critic")
                 print(f"✓ Saved to: {output_file}")
                 print()
             else:
-                response = agent.run(question, verbose=args.verbose)
-                print("\n" + "=" * 60)
-                print("Answer:")
-                print("=" * 60)
-                print(response)
+                response = _cached_answer(
+                    cache, _cache_scope(args, "single-agent"), question,
+                    lambda: {"response": agent.run(question, verbose=args.verbose)},
+                    answer_field="response",
+                )["response"]
+                _print_section("Answer:", response)
 
                 # Auto-save in interactive mode
                 output_file = save_answer_to_file(response, question, mode="single-agent")
                 print(f"✓ Saved to: {output_file}")
                 print()
 
-    else:
+    elif not args.cache_stats:
         # No input provided
         parser.print_help()
 
+    if args.cache_stats:
+        _print_cache_stats(cache)
+    _close_semantic_cache(cache)
+
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,10 @@
-"""Tools module for CoScientist."""
+"""Tools module for CoScientist.
 
-from src.tools.implementations import (
-    execute_python,
-    search_pubmed,
-    query_database,
-    read_file,
-    get_tool_definitions,
-)
+Tools are resolved lazily (PEP 562): importing src.tools, or one of its
+submodules, does not load src.tools.implementations until a tool is accessed.
+"""
+
+import importlib
 
 __all__ = [
     "execute_python",
@@ -15,3 +13,16 @@ __all__ = [
     "read_file",
     "get_tool_definitions",
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        value = getattr(importlib.import_module("src.tools.implementations"), name)
+        # Cache on the package so later lookups bypass __getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,114 @@
+"""Persistent cache for PubMed search results.
+
+search_pubmed issues two NCBI E-utilities requests per call. Identical
+searches are served from an in-process LRU and, across runs, from an on-disk
+store under ~/.coscientist/pubmed_cache (diskcache when installed, one JSON
+file per search otherwise). Entries expire after PUBMED_CACHE_TTL seconds;
+E-utilities responses carry no ETag/Last-Modified to revalidate against.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from src.tools.implementations import ToolResult, search_pubmed
+
+try:
+    import diskcache
+except ImportError:  # Optional dependency
+    diskcache = None
+
+PUBMED_CACHE_DIR = Path.home() / ".coscientist" / "pubmed_cache"
+PUBMED_CACHE_TTL = 7 * 24 * 3600
+
+_disk = None
+
+
+def _cache_key(query: str, max_results: int, retmax: int) -> str:
+    """Stable key for one search."""
+    raw = f"{query}\x00{max_results}\x00{retmax}".encode()
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _disk_get(key: str) -> Optional[Any]:
+    """Return the stored output for key, or None if missing or expired."""
+    global _disk
+    if diskcache is not None:
+        if _disk is None:
+            _disk = diskcache.Cache(str(PUBMED_CACHE_DIR))
+        return _disk.get(key)
+
+    path = PUBMED_CACHE_DIR / f"{key}.json"
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get("created", 0) > PUBMED_CACHE_TTL:
+        return None
+    return entry.get("output")
+
+
+def _disk_set(key: str, output: Any):
+    """Store output under key (best effort; cache write failures are ignored)."""
+    global _disk
+    try:
+        if diskcache is not None:
+            if _disk is None:
+                _disk = diskcache.Cache(str(PUBMED_CACHE_DIR))
+            _disk.set(key, output, expire=PUBMED_CACHE_TTL)
+            return
+
+        PUBMED_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so readers never see partial JSON
+        fd, tmp_path = tempfile.mkstemp(dir=PUBMED_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "output": output}, f)
+        os.replace(tmp_path, PUBMED_CACHE_DIR / f"{key}.json")
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+class _UncachedResult(Exception):
+    """Carries a failed search result out of the lru_cache layer uncached."""
+
+    def __init__(self, result: ToolResult):
+        super().__init__(result.error)
+        self.result = result
+
+
+@lru_cache(maxsize=512)
+def _search(query: str, max_results: int, retmax: int) -> ToolResult:
+    """Serve a search from disk, or run it and store a successful result."""
+    key = _cache_key(query, max_results, retmax)
+    output = _disk_get(key)
+    if output is not None:
+        return ToolResult(True, output)
+
+    result = search_pubmed(query, max_results=max_results, retmax=retmax)
+    if not result.success:
+        raise _UncachedResult(result)
+    _disk_set(key, result.output)
+    return result
+
+
+def cached_search_pubmed(query: str, max_results: int = 10, retmax: int = 100) -> ToolResult:
+    """search_pubmed with in-process and on-disk caching of successful results.
+
+    Args:
+        query: Search query string
+        max_results: Maximum results to return
+        retmax: Maximum results to fetch from NCBI
+
+    Returns:
+        ToolResult with list of articles
+    """
+    try:
+        return _search(query, max_results, retmax)
+    except _UncachedResult as exc:
+        return exc.result
@@ -1,14 +1,24 @@
 """Tool implementations for the bioinformatics agent."""
 
+import ast
+import asyncio
+import hashlib
+import importlib
+import inspect
 import json
-import subprocess
+import logging
+import pickle
 import tempfile
+import types
 from pathlib import Path
 from typing import Any, Optional
 import requests
 import sys
 from io import StringIO
 import signal
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from contextlib import contextmanager
 import os
 
@@ -25,6 +35,9 @@ else:
     print(f"✓ OPENROUTER_KEY loaded: {os.getenv('OPENROUTER_KEY')[:15]}...", file=sys.stderr)
 
 
+_LOG = logging.getLogger("coscientist")
+
+
 class ToolResult:
     """Result wrapper for tool execution."""
 
@@ -41,19 +54,166 @@ class ToolResult:
         }
 
 
+# AST nodes allowed in a snippet whose output can be memoized: print() calls
+# over names, attributes, subscripts, literals and operators. Anything else
+# (assignments, imports, other calls, comprehensions, ...) may change state.
+# The names must also hold immutable values (see _is_immutable_value).
+_PRINT_ONLY_NODES = (
+    ast.Module, ast.Expr, ast.Call, ast.keyword, ast.Name, ast.Load, ast.Attribute,
+    ast.Subscript, ast.Slice, ast.Constant, ast.JoinedStr, ast.FormattedValue,
+    ast.Tuple, ast.List, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+    ast.operator, ast.unaryop, ast.boolop, ast.cmpop,
+)
+
+
+# Exact types whose values cannot change; formatting, indexing, attribute
+# access and operators on them run no user code
+_IMMUTABLE_TYPES = (int, float, complex, bool, str, bytes, type(None))
+
+
+@lru_cache(maxsize=1024)
+def _print_only_names(code: str) -> Optional[frozenset]:
+    """Names read by a snippet that only prints.
+
+    Args:
+        code: Python source
+
+    Returns:
+        The names the snippet loads (including print), or None unless every
+        statement is a print() of names, attributes, subscripts, literals and
+        operators
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+    if not tree.body:
+        return None
+    names = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, _PRINT_ONLY_NODES):
+            return None
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Call):
+            if not (isinstance(node.func, ast.Name) and node.func.id == "print"):
+                return None
+            # file= would write somewhere other than the captured stdout
+            if any(kw.arg not in ("sep", "end") for kw in node.keywords):
+                return None
+    return frozenset(names)
+
+
+def _is_immutable_value(value: Any) -> bool:
+    """Whether a value (and everything it contains) has an immutable builtin type.
+
+    Subclasses do not count: they may override __str__, __getattr__ or
+    __getitem__ with code whose result changes between runs.
+    """
+    if type(value) in (tuple, frozenset):
+        return all(_is_immutable_value(item) for item in value)
+    return type(value) in _IMMUTABLE_TYPES
+
+
+@lru_cache(maxsize=1024)
+def _compile_snippet(code: str):
+    """Compile a snippet once; re-submitted code reuses the cached code object.
+
+    The "<string>" filename keeps error messages identical to exec(str).
+    dont_inherit keeps this module's compiler flags out of user code, and
+    top-level await is accepted (such snippets compile to a coroutine).
+    Optimization stays at the default so user asserts still run.
+    """
+    return compile(code, "<string>", "exec", flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT, dont_inherit=True)
+
+
+class _ThreadCaptureStream:
+    """Stand-in for sys.stdout / sys.stderr that captures one thread's writes.
+
+    execute_python runs in worker threads while the agent loop (and other
+    agents sharing the event loop) keep printing. Swapping sys.stdout for a
+    StringIO would capture their output too, so instead this proxy sends a
+    write to the calling thread's capture buffer if it has one, and to the
+    wrapped stream otherwise.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def _target(self):
+        buffer = getattr(self._local, "buffer", None)
+        return buffer if buffer is not None else self._stream
+
+    @contextmanager
+    def capture(self):
+        """Redirect the current thread's writes into a fresh StringIO."""
+        buffer = StringIO()
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = None
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def writelines(self, lines):
+        return self._target().writelines(lines)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        # encoding, isatty, fileno, reconfigure, ...
+        return getattr(self._target(), name)
+
+
+def _capture_stream(name: str) -> _ThreadCaptureStream:
+    """Return the capture proxy installed as sys.<name>, installing it if needed."""
+    stream = getattr(sys, name)
+    if not isinstance(stream, _ThreadCaptureStream):
+        stream = _ThreadCaptureStream(stream)
+        setattr(sys, name, stream)
+    return stream
+
+
 class PersistentPythonExecutor:
     """Maintains a persistent Python environment across execute_python calls.
 
     This allows variables, imports, and state to persist between calls,
-    enabling multi-step data analysis without reloading data.
+    enabling multi-step data analysis without reloading data. Executions are
+    serialized with a lock because the namespace and the stdout/stderr
+    redirection are shared process-wide.
+
+    Output of print-only snippets that read only immutable values is memoized
+    per session version; any other snippet (or a failure, or reset()) starts a
+    new version.
+
+    If the COSCIENTIST_SESSION_SNAPSHOT environment variable names a file, the
+    session's variables are saved there after each state-changing snippet and
+    restored on first use in a later process, so repeated runs skip rebuilding
+    the same data. Modules are re-imported; unpicklable values are skipped.
     """
 
+    OUTPUT_MEMO_SIZE = 256
+    SNAPSHOT_ENV = "COSCIENTIST_SESSION_SNAPSHOT"
+
     def __init__(self):
         """Initialize the persistent Python environment."""
         self.globals_dict = {
             '__builtins__': __builtins__,
         }
         self.locals_dict = {}
+        self._lock = threading.Lock()
+        self._session_version = 0
+        self._output_memo: OrderedDict[tuple[int, str], str] = OrderedDict()
+        snapshot = os.environ.get(self.SNAPSHOT_ENV)
+        self._snapshot_path = Path(snapshot).expanduser() if snapshot else None
+        self._snapshot_restored = False
+        # Digest of the last snapshot written, and (scope, name) -> (fingerprint, pickle)
+        self._snapshot_digest: Optional[bytes] = None
+        self._pickled: dict[tuple[str, str], tuple[Optional[bytes], bytes]] = {}
 
     def execute(self, code: str, timeout: int = 30) -> tuple[bool, Optional[str], Optional[str]]:
         """Execute code in the persistent environment.
@@ -65,47 +225,236 @@ class PersistentPythonExecutor:
         Returns:
             Tuple of (success, output, error)
         """
-        # Capture stdout/stderr
-        old_stdout = sys.stdout
-        old_stderr = sys.stderr
-        sys.stdout = StringIO()
-        sys.stderr = StringIO()
+        with self._lock:
+            if self._snapshot_path is not None and not self._snapshot_restored:
+                self._restore_snapshot()
+
+            if not self._is_memoizable(code):
+                self._session_version += 1
+                success, output, error = self._execute_locked(code)
+                if success and self._snapshot_path is not None:
+                    self._save_snapshot()
+                return success, output, error
+
+            key = (self._session_version, code)
+            output = self._output_memo.get(key)
+            if output is not None:
+                self._output_memo.move_to_end(key)
+                return True, output, None
+
+            success, output, error = self._execute_locked(code)
+            if success:
+                self._output_memo[key] = output
+                if len(self._output_memo) > self.OUTPUT_MEMO_SIZE:
+                    self._output_memo.popitem(last=False)
+            else:
+                self._session_version += 1
+            return success, output, error
 
-        try:
-            # Execute code in persistent namespace
-            exec(code, self.globals_dict, self.locals_dict)
+    def _is_memoizable(self, code: str) -> bool:
+        """Whether rerunning code on unchanged state must print the same output.
 
-            # Get output
-            output = sys.stdout.getvalue()
-            error = sys.stderr.getvalue()
+        The snippet has to be print-only and read only session variables
+        holding immutable values, with print itself not redefined. Objects
+        such as iterators, clocks or instances with properties can print
+        something new on every run, so snippets reading them are executed.
+        Caller must hold self._lock.
+        """
+        names = _print_only_names(code)
+        if names is None:
+            return False
+        for name in names:
+            if name in self.locals_dict:
+                value = self.locals_dict[name]
+            elif name in self.globals_dict:
+                value = self.globals_dict[name]
+            else:
+                # Only print may come from builtins; anything else is unbound
+                # or a builtin object
+                if name != "print":
+                    return False
+                continue
+            if not _is_immutable_value(value):
+                return False
+        return True
+
+    def _execute_locked(self, code: str) -> tuple[bool, Optional[str], Optional[str]]:
+        """Execute code; caller must hold self._lock."""
+        # Capture this thread's stdout/stderr only; other threads keep printing
+        with _capture_stream("stdout").capture() as stdout, _capture_stream("stderr").capture() as stderr:
+            try:
+                # Execute code in persistent namespace
+                code_obj = _compile_snippet(code)
+                if code_obj.co_flags & inspect.CO_COROUTINE:
+                    # Snippet uses top-level await: evaluating it yields a coroutine
+                    asyncio.run(eval(code_obj, self.globals_dict, self.locals_dict))
+                else:
+                    exec(code_obj, self.globals_dict, self.locals_dict)
+            except Exception as e:
+                return False, None, f"Execution error: {type(e).__name__}: {str(e)}"
 
-            # Restore stdout/stderr
-            sys.stdout = old_stdout
-            sys.stderr = old_stderr
+        output = stdout.getvalue()
+        error = stderr.getvalue()
+        if error:
+            return False, None, error
 
-            if error:
-                return False, None, error
+        return True, output.strip() if output else "Code executed successfully (no output)", None
 
-            return True, output.strip() if output else "Code executed successfully (no output)", None
+    @staticmethod
+    def _fingerprint(value: Any) -> Optional[bytes]:
+        """Content digest for DataFrames, Series and arrays, or None for other values.
 
-        except Exception as e:
-            # Restore stdout/stderr
-            sys.stdout = old_stdout
-            sys.stderr = old_stderr
+        Uses pandas' vectorized row hashing (hash_pandas_object) rather than
+        str()/repr(), which truncates large frames and so cannot detect changes.
+        pandas/numpy are only consulted if a snippet has already imported them.
+        """
+        pd = sys.modules.get("pandas")
+        np = sys.modules.get("numpy")
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            if pd is not None and isinstance(value, (pd.DataFrame, pd.Series)):
+                digest.update(type(value).__name__.encode())
+                if isinstance(value, pd.DataFrame):
+                    digest.update(repr((list(value.columns), list(map(str, value.dtypes)))).encode())
+                else:
+                    digest.update(repr((value.name, str(value.dtype))).encode())
+                digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+                return digest.digest()
+            if np is not None and isinstance(value, np.ndarray) and value.dtype != object:
+                digest.update(repr((value.shape, str(value.dtype))).encode())
+                digest.update(np.ascontiguousarray(value).tobytes())
+                return digest.digest()
+        except TypeError:
+            # Unhashable cells (lists, dicts) in object columns
+            pass
+        return None
+
+    def _snapshot_namespace(self, scope: str, namespace: dict[str, Any]) -> dict[str, tuple[str, Any]]:
+        """Encode a namespace as {name: ("module", module_name) | ("pickle", bytes)}.
+
+        DataFrames and arrays whose fingerprint is unchanged since the last
+        snapshot reuse their previous pickle instead of being serialized again.
+        """
+        state = {}
+        for name, value in namespace.items():
+            if name.startswith("__"):
+                continue
+            if isinstance(value, types.ModuleType):
+                state[name] = ("module", value.__name__)
+                continue
+            fingerprint = self._fingerprint(value)
+            cached = self._pickled.get((scope, name))
+            if fingerprint is not None and cached is not None and cached[0] == fingerprint:
+                state[name] = ("pickle", cached[1])
+                continue
+            try:
+                encoded = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                # Snippet-defined functions, open files, etc. cannot be saved
+                continue
+            self._pickled[(scope, name)] = (fingerprint, encoded)
+            state[name] = ("pickle", encoded)
+        return state
+
+    @staticmethod
+    def _restore_namespace(namespace: dict[str, Any], state: dict[str, tuple[str, Any]]):
+        """Decode a _snapshot_namespace() result into namespace (best effort)."""
+        for name, (kind, value) in state.items():
+            try:
+                namespace[name] = importlib.import_module(value) if kind == "module" else pickle.loads(value)
+            except Exception:
+                pass
+
+    def _save_snapshot(self):
+        """Write the session variables to the snapshot file; caller must hold self._lock."""
+        state = {
+            "globals": self._snapshot_namespace("globals", self.globals_dict),
+            "locals": self._snapshot_namespace("locals", self.locals_dict),
+        }
+        # Drop pickles of variables that no longer exist
+        for key in [key for key in self._pickled if key[1] not in state[key[0]]]:
+            del self._pickled[key]
+
+        digest = hashlib.blake2b(digest_size=16)
+        for scope in ("globals", "locals"):
+            for name, (kind, value) in sorted(state[scope].items()):
+                digest.update(f"{scope}\0{name}\0{kind}\0".encode())
+                digest.update(value.encode() if kind == "module" else value)
+        if digest.digest() == self._snapshot_digest:
+            return
 
-            return False, None, f"Execution error: {type(e).__name__}: {str(e)}"
+        try:
+            self._snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so a crash never leaves a partial snapshot
+            fd, tmp_path = tempfile.mkstemp(dir=self._snapshot_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._snapshot_path)
+            self._snapshot_digest = digest.digest()
+        except OSError:
+            pass
+
+    def _restore_snapshot(self):
+        """Load variables saved by an earlier process; caller must hold self._lock."""
+        self._snapshot_restored = True
+        try:
+            with open(self._snapshot_path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return
+        self._restore_namespace(self.globals_dict, state.get("globals", {}))
+        self._restore_namespace(self.locals_dict, state.get("locals", {}))
+        self._session_version += 1
 
     def reset(self):
         """Reset the persistent environment (clears all variables)."""
-        self.globals_dict = {
-            '__builtins__': __builtins__,
-        }
-        self.locals_dict = {}
+        with self._lock:
+            self.globals_dict = {
+                '__builtins__': __builtins__,
+            }
+            self.locals_dict = {}
+            self._session_version += 1
+            self._output_memo.clear()
+            if self._snapshot_path is not None:
+                # A cleared session must not come back in the next process
+                self._snapshot_restored = True
+                self._snapshot_path.unlink(missing_ok=True)
+                self._snapshot_digest = None
+                self._pickled.clear()
 
 
 # Global persistent executor instance
 _persistent_executor = PersistentPythonExecutor()
 
+# Heavy modules analysis snippets almost always import; prewarm_imports()
+# loads them in the background so the first execute_python call finds them
+# in sys.modules
+PREWARM_MODULES = ("numpy", "pandas")
+_prewarm_started = False
+
+
+def _import_modules(names: tuple[str, ...]):
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+
+def prewarm_imports():
+    """Start importing PREWARM_MODULES in a daemon thread (once per process).
+
+    A concurrent import of the same module from execute_python simply waits on
+    the import lock, so this never imports anything twice.
+    """
+    global _prewarm_started
+    if _prewarm_started:
+        return
+    _prewarm_started = True
+    threading.Thread(
+        target=_import_modules, args=(PREWARM_MODULES,), name="prewarm-imports", daemon=True
+    ).start()
+
 
 def execute_python(code: str, timeout: int = 30, reset: bool = False) -> ToolResult:
     """Execute Python code in a persistent environment.
@@ -138,115 +487,139 @@ def execute_python(code: str, timeout: int = 30, reset: bool = False) -> ToolRes
         return ToolResult(False, None, f"Error executing code: {str(e)}")
 
 
-def search_pubmed(query: str, max_results: int = 10, retmax: int = 100) -> ToolResult:
-    """Search PubMed for articles.
+def _parse_pubmed_article(article) -> dict[str, Any]:
+    """Extract the fields we report from one <PubmedArticle> element."""
+    # Extract PMID
+    pmid_elem = article.find(".//PMID")
+    pmid = pmid_elem.text if pmid_elem is not None else "N/A"
+
+    # Extract title
+    title_elem = article.find(".//ArticleTitle")
+    title = title_elem.text if title_elem is not None else "N/A"
+
+    # Extract abstract (combine all AbstractText elements)
+    abstract_parts = []
+    for abstract_text in article.findall(".//AbstractText"):
+        # Check for labeled sections (e.g., BACKGROUND, METHODS)
+        label = abstract_text.get("Label", "")
+        text = abstract_text.text or ""
+        if label:
+            abstract_parts.append(f"{label}: {text}")
+        else:
+            abstract_parts.append(text)
+    abstract = " ".join(abstract_parts) if abstract_parts else "N/A"
+
+    # Extract authors (first 3)
+    authors = []
+    for author in article.findall(".//Author")[:3]:
+        last_name = author.find(".//LastName")
+        initials = author.find(".//Initials")
+        if last_name is not None:
+            author_name = last_name.text
+            if initials is not None:
+                author_name += f" {initials.text}"
+            authors.append(author_name)
+
+    # Extract publication date
+    pub_date = article.find(".//PubDate")
+    date_str = "N/A"
+    if pub_date is not None:
+        year = pub_date.find("Year")
+        month = pub_date.find("Month")
+        if year is not None:
+            date_str = year.text
+            if month is not None:
+                date_str = f"{year.text} {month.text}"
+
+    return {
+        "pmid": pmid,
+        "title": title,
+        "abstract": abstract,
+        "authors": authors,
+        "pubdate": date_str,
+    }
+
+
+def iter_pubmed(query: str, max_results: int = 10, retmax: int = 100):
+    """Search PubMed and yield articles as they are parsed.
+
+    The efetch response is streamed through ElementTree.iterparse and each
+    article element is cleared once parsed, so memory stays proportional to
+    one article rather than the whole batch.
 
     Args:
         query: Search query string
         max_results: Maximum results to return
         retmax: Maximum results to fetch from NCBI
 
-    Returns:
-        ToolResult with list of articles
+    Yields:
+        Article dicts with pmid, title, abstract, authors, pubdate
+
+    Raises:
+        requests.RequestException: If an E-utilities request fails
+        xml.etree.ElementTree.ParseError: If the efetch response is malformed
     """
     import xml.etree.ElementTree as ET
-    
-    try:
-        # NCBI E-utilities endpoints
-        search_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-        fetch_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
-
-        # Search for PMIDs
-        search_params = {
-            "db": "pubmed",
-            "term": query,
-            "retmode": "json",
-            "retmax": retmax,
-        }
 
-        search_response = requests.get(search_url, params=search_params, timeout=10)
-        search_response.raise_for_status()
-        search_data = search_response.json()
+    # NCBI E-utilities endpoints
+    search_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+    fetch_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
 
-        pmids = search_data.get("esearchresult", {}).get("idlist", [])[:max_results]
+    # Search for PMIDs
+    search_params = {
+        "db": "pubmed",
+        "term": query,
+        "retmode": "json",
+        "retmax": retmax,
+    }
 
-        if not pmids:
-            return ToolResult(True, [])
+    search_response = requests.get(search_url, params=search_params, timeout=10)
+    search_response.raise_for_status()
+    search_data = search_response.json()
 
-        # Fetch full article details using efetch (includes abstracts)
-        fetch_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
-        fetch_params = {
-            "db": "pubmed",
-            "id": ",".join(pmids),
-            "retmode": "xml",
-            "rettype": "abstract",
-        }
+    pmids = search_data.get("esearchresult", {}).get("idlist", [])[:max_results]
+
+    if not pmids:
+        return
+
+    # Fetch full article details using efetch (includes abstracts)
+    fetch_params = {
+        "db": "pubmed",
+        "id": ",".join(pmids),
+        "retmode": "xml",
+        "rettype": "abstract",
+    }
 
-        fetch_response = requests.get(fetch_url, params=fetch_params, timeout=15)
+    with requests.get(fetch_url, params=fetch_params, timeout=15, stream=True) as fetch_response:
         fetch_response.raise_for_status()
-        
-        # Parse XML response
-        root = ET.fromstring(fetch_response.content)
-
-        articles = []
-        for article in root.findall(".//PubmedArticle"):
-            # Extract PMID
-            pmid_elem = article.find(".//PMID")
-            pmid = pmid_elem.text if pmid_elem is not None else "N/A"
-            
-            # Extract title
-            title_elem = article.find(".//ArticleTitle")
-            title = title_elem.text if title_elem is not None else "N/A"
-            
-            # Extract abstract (combine all AbstractText elements)
-            abstract_parts = []
-            for abstract_text in article.findall(".//AbstractText"):
-                # Check for labeled sections (e.g., BACKGROUND, METHODS)
-                label = abstract_text.get("Label", "")
-                text = abstract_text.text or ""
-                if label:
-                    abstract_parts.append(f"{label}: {text}")
-                else:
-                    abstract_parts.append(text)
-            abstract = " ".join(abstract_parts) if abstract_parts else "N/A"
-            
-            # Extract authors (first 3)
-            authors = []
-            for author in article.findall(".//Author")[:3]:
-                last_name = author.find(".//LastName")
-                initials = author.find(".//Initials")
-                if last_name is not None:
-                    author_name = last_name.text
-                    if initials is not None:
-                        author_name += f" {initials.text}"
-                    authors.append(author_name)
-            
-            # Extract publication date
-            pub_date = article.find(".//PubDate")
-            date_str = "N/A"
-            if pub_date is not None:
-                year = pub_date.find("Year")
-                month = pub_date.find("Month")
-                if year is not None:
-                    date_str = year.text
-                    if month is not None:
-                        date_str = f"{year.text} {month.text}"
-
-            articles.append({
-                "pmid": pmid,
-                "title": title,
-                "abstract": abstract,
-                "authors": authors,
-                "pubdate": date_str,
-            })
+        # Let urllib3 undo any gzip/deflate transfer encoding while streaming
+        fetch_response.raw.decode_content = True
 
-        return ToolResult(True, articles)
+        for _event, elem in ET.iterparse(fetch_response.raw, events=("end",)):
+            if elem.tag == "PubmedArticle":
+                yield _parse_pubmed_article(elem)
+                elem.clear()
+
+
+def search_pubmed(query: str, max_results: int = 10, retmax: int = 100) -> ToolResult:
+    """Search PubMed for articles.
+
+    Args:
+        query: Search query string
+        max_results: Maximum results to return
+        retmax: Maximum results to fetch from NCBI
+
+    Returns:
+        ToolResult with list of articles
+    """
+    try:
+        return ToolResult(True, list(iter_pubmed(query, max_results=max_results, retmax=retmax)))
 
     except Exception as e:
         return ToolResult(False, None, f"PubMed search error: {str(e)}")
 
 
-def _chunked_search(file_path: str, sep: str, column: str, search_value: str, limit: int = 10, chunk_size: int = 10000, max_chunks: int = 50) -> tuple[list, int]:
+def _chunked_search(file_path: str, sep: str, column: str, search_value: str, limit: int = 10, chunk_size: int = 10000, max_chunks: int = 50, regex: bool = True) -> tuple[list, int]:
     """Search a large file in chunks until enough results are found.
 
     Args:
@@ -257,6 +630,7 @@ def _chunked_search(file_path: str, sep: str, column: str, search_value: str, li
         limit: Maximum results to return
         chunk_size: Rows per chunk
         max_chunks: Maximum chunks to search (safety limit)
+        regex: Treat search_value as a regular expression (else a literal substring)
 
     Returns:
         Tuple of (results_list, total_rows_searched)
@@ -270,7 +644,7 @@ def _chunked_search(file_path: str, sep: str, column: str, search_value: str, li
         total_searched += len(chunk)
 
         # Search this chunk
-        matches = chunk[chunk[column].astype(str).str.contains(search_value, case=False, na=False)]
+        matches = chunk[chunk[column].astype(str).str.contains(search_value, case=False, na=False, regex=regex)]
         results.extend(matches.to_dict('records'))
 
         # Stop if we have enough results
@@ -284,6 +658,131 @@ def _chunked_search(file_path: str, sep: str, column: str, search_value: str, li
     return results, total_searched
 
 
+# Columnar copies of CSV databases live here (the data directory may be read-only)
+TABLE_CACHE_DIR = Path.home() / ".coscientist" / "table_cache"
+
+# Loaded pyarrow tables keyed by CSV path, with the mtime they were loaded for
+_table_cache: dict[str, tuple[int, Any]] = {}
+_table_cache_lock = threading.Lock()
+
+
+def _load_csv_table(file_path: Path):
+    """Load a CSV database as a pyarrow Table via a cached Parquet copy.
+
+    The first access converts the CSV to Parquet under TABLE_CACHE_DIR; later
+    processes memory-map that copy instead of re-parsing the CSV, and the
+    table stays in memory for the rest of this process. Both are invalidated
+    when the CSV's mtime changes. If TABLE_CACHE_DIR cannot be written, the
+    parsed table is only kept in memory.
+
+    Args:
+        file_path: Path to the CSV file
+
+    Returns:
+        pyarrow.Table, or None if pyarrow is not installed
+    """
+    try:
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pq
+    except ImportError:  # Optional dependency
+        return None
+
+    mtime_ns = file_path.stat().st_mtime_ns
+    key = str(file_path.resolve())
+
+    with _table_cache_lock:
+        cached = _table_cache.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+        prefix = f"{file_path.stem}-{digest}-"
+        parquet_path = TABLE_CACHE_DIR / f"{prefix}{mtime_ns}.parquet"
+        if parquet_path.exists():
+            table = pq.read_table(parquet_path, memory_map=True)
+        else:
+            # Empty cells become nulls, as with pandas.read_csv
+            table = pa_csv.read_csv(file_path, convert_options=pa_csv.ConvertOptions(strings_can_be_null=True))
+            try:
+                _write_parquet_copy(table, parquet_path, prefix)
+            except OSError:
+                # Cache directory not writable: keep using the in-memory table
+                pass
+
+        _table_cache[key] = (mtime_ns, table)
+        return table
+
+
+def _write_parquet_copy(table, parquet_path: Path, prefix: str):
+    """Save a table's Parquet copy and delete copies of older CSV versions.
+
+    Args:
+        table: pyarrow.Table to write
+        parquet_path: Destination under TABLE_CACHE_DIR
+        prefix: File name prefix shared by every copy of the same CSV
+    """
+    import pyarrow.parquet as pq
+
+    TABLE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Write to a unique temp file and rename so concurrent writers never
+    # collide and readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=TABLE_CACHE_DIR, prefix=prefix, suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, parquet_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+    for stale in TABLE_CACHE_DIR.iterdir():
+        if stale.name.startswith(prefix) and stale.suffix == ".parquet" and stale != parquet_path:
+            stale.unlink(missing_ok=True)
+
+
+def _read_csv_head(file_path: Path, limit: int):
+    """First `limit` rows of a CSV database as a DataFrame (cached table when available)."""
+    table = _load_csv_table(file_path)
+    if table is None:
+        import pandas as pd
+        return pd.read_csv(file_path, nrows=limit, low_memory=False)
+    return table.slice(0, limit).to_pandas()
+
+
+def _search_csv_table(file_path: Path, column: str, search_value: str, limit: int = 10) -> tuple[list, int]:
+    """Case-insensitive substring search of one column of a CSV database.
+
+    Runs as a single vectorized pyarrow.compute kernel over the cached table
+    (see _load_csv_table); falls back to _chunked_search without pyarrow.
+    search_value is matched literally on both paths, not as a regex.
+
+    Args:
+        file_path: Path to the CSV file
+        column: Column to search in
+        search_value: Value to search for
+        limit: Maximum results to return
+
+    Returns:
+        Tuple of (results_list, total_rows_searched)
+    """
+    table = _load_csv_table(file_path)
+    if table is None:
+        return _chunked_search(file_path, ",", column, search_value, limit=limit, regex=False)
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if column not in table.column_names:
+        raise KeyError(column)
+
+    values = table.column(column)
+    if not pa.types.is_string(values.type):
+        values = pc.cast(values, pa.string())
+    mask = pc.match_substring(values, search_value, ignore_case=True)
+    matches = table.filter(mask).slice(0, limit)
+    return matches.to_pandas().to_dict('records'), table.num_rows
+
+
 def query_database(db_name: str, query: str, limit: int = 10, data_dir: str = "/home.galaxy4/sumin/project/aisci/Competition_Data") -> ToolResult:
     """Query a local database file.
 
@@ -382,24 +881,38 @@ def query_database(db_name: str, query: str, limit: int = 10, data_dir: str = "/
                 return ToolResult(True, {
                     "database": "Pharos",
                     "available_files": files,
-                    "message": "Use query like 'file:pharos_drugs' to query specific file"
+                    "message": "Use query like 'file:pharos_drugs' to query specific file, or 'Symbol:CYP2D6' to search pharos_drugs"
                 })
             elif query.lower().startswith("file:"):
                 file_name = query.split(":", 1)[1].strip()
                 file_path = pharos_path / f"{file_name}.csv"
                 if not file_path.exists():
                     return ToolResult(False, None, f"File {file_name}.csv not found")
-                df = pd.read_csv(file_path, nrows=limit, low_memory=False)
+                df = _read_csv_head(file_path, limit)
                 return ToolResult(True, {
                     "file": file_name,
                     "shape": df.shape,
                     "columns": df.columns.tolist(),
                     "sample": df.to_dict('records')
                 })
+            elif ":" in query:
+                # Column-based search in the drugs file: "Symbol:CYP2D6"
+                col, value = (part.strip() for part in query.split(":", 1))
+                file_path = pharos_path / "pharos_drugs.csv"
+                columns = _read_csv_head(file_path, 0).columns.tolist()
+                if col not in columns:
+                    return ToolResult(False, None, f"Column '{col}' not found in pharos_drugs.csv. Available columns: {columns}")
+                results, rows_searched = _search_csv_table(file_path, col, value, limit=limit)
+                return ToolResult(True, {
+                    "count": len(results),
+                    "rows_searched": rows_searched,
+                    "results": results,
+                    "message": f"Searched {rows_searched:,} rows, found {len(results)} matches"
+                })
             else:
                 # Default to drugs file
                 file_path = pharos_path / "pharos_drugs.csv"
-                df = pd.read_csv(file_path, nrows=limit, low_memory=False)
+                df = _read_csv_head(file_path, limit)
                 return ToolResult(True, {
                     "file": "pharos_drugs",
                     "columns": df.columns.tolist(),
@@ -685,7 +1198,7 @@ def search_literature(
             # CRITICAL: For openrouter/ models, LiteLLM uses OpenAI client internally
             # which expects OPENAI_API_KEY to be set!
             os.environ["OPENAI_API_KEY"] = api_key
-            print(f"[DEBUG] Set API keys in os.environ (OPENROUTER_API_KEY, OPENAI_API_KEY): {api_key[:15]}...", file=sys.stderr)
+            _LOG.debug("Set API keys in os.environ (OPENROUTER_API_KEY, OPENAI_API_KEY): %.15s...", api_key)
 
         # For non-local embeddings, also need the API key
         if not using_local_embeddings and embedding_config.startswith("openrouter/"):
@@ -729,15 +1242,15 @@ def search_literature(
         # No need to process it again here
 
         # Debug: Print what we're actually using
-        print(f"[DEBUG] PaperQA LLM: {config.paperqa_llm}", file=sys.stderr)
-        print(f"[DEBUG] PaperQA Embedding: {embedding_config}", file=sys.stderr)
-        print(f"[DEBUG] Using local embeddings: {using_local_embeddings}", file=sys.stderr)
+        _LOG.debug("PaperQA LLM: %s", config.paperqa_llm)
+        _LOG.debug("PaperQA Embedding: %s", embedding_config)
+        _LOG.debug("Using local embeddings: %s", using_local_embeddings)
 
         # For local embeddings, verify sentence-transformers is installed
         if using_local_embeddings:
             try:
                 import sentence_transformers
-                print(f"[DEBUG] sentence-transformers version: {sentence_transformers.__version__}", file=sys.stderr)
+                _LOG.debug("sentence-transformers version: %s", sentence_transformers.__version__)
             except ImportError:
                 return ToolResult(
                     False,
@@ -782,7 +1295,7 @@ def search_literature(
 
         settings = Settings(**settings_kwargs)
         llm_status = "LLM enabled for metadata extraction" if settings.parsing.use_doc_details else "LLM disabled during PDF loading"
-        print(f"[DEBUG] Parsing config: use_doc_details={settings.parsing.use_doc_details} ({llm_status})", file=sys.stderr)
+        _LOG.debug("Parsing config: use_doc_details=%s (%s)", settings.parsing.use_doc_details, llm_status)
 
         # Create document collection
         docs = Docs()
@@ -800,27 +1313,26 @@ def search_literature(
                 max_retries = 3
                 for attempt in range(max_retries):
                     try:
-                        print(f"[DEBUG] Loading PDF: {pdf_file.name}...", file=sys.stderr)
+                        _LOG.debug("Loading PDF: %s...", pdf_file.name)
                         # Provide a basic citation - LLM may be used for metadata extraction if use_doc_details=True
                         simple_citation = f"{pdf_file.stem}, Local PDF"
                         docs.add(str(pdf_file), citation=simple_citation, settings=settings)
                         pdf_count += 1
-                        llm_used_msg = "with LLM metadata extraction" if settings.parsing.use_doc_details else "no LLM call"
-                        print(f"[DEBUG] Successfully loaded {pdf_file.name} ({llm_used_msg})", file=sys.stderr)
+                        if _LOG.isEnabledFor(logging.DEBUG):
+                            llm_used_msg = "with LLM metadata extraction" if settings.parsing.use_doc_details else "no LLM call"
+                            _LOG.debug("Successfully loaded %s (%s)", pdf_file.name, llm_used_msg)
                         break  # Success, move to next PDF
                     except Exception as e:
                         error_str = str(e).lower()
                         # Detailed error logging
-                        print(f"[DEBUG] Error loading {pdf_file.name}: {str(e)}", file=sys.stderr)
-                        import traceback
-                        traceback.print_exc()
+                        _LOG.warning("Error loading %s: %s", pdf_file.name, e, exc_info=True)
 
                         # Check if it's a rate limit error
                         if "rate" in error_str or "429" in error_str:
                             if attempt < max_retries - 1:
                                 # Exponential backoff: 2, 4, 8 seconds
                                 wait_time = 2 ** (attempt + 1)
-                                print(f"[DEBUG] Rate limit hit, retrying in {wait_time}s...", file=sys.stderr)
+                                _LOG.info("Rate limit hit, retrying in %ss...", wait_time)
                                 time.sleep(wait_time)
                                 continue  # Retry
                         # Non-rate-limit error or final retry failed
@@ -856,8 +1368,8 @@ def search_literature(
             # Query local papers first
             if pdf_count > 0:
                 try:
-                    print(f"[DEBUG] Querying with LLM: {settings.llm}", file=sys.stderr)
-                    print(f"[DEBUG] Querying with embedding: {settings.embedding}", file=sys.stderr)
+                    _LOG.debug("Querying with LLM: %s", settings.llm)
+                    _LOG.debug("Querying with embedding: %s", settings.embedding)
                     local_answer = docs.query(question, settings=settings)
                     
                     # Check if local answer is sufficient (has contexts and not "I cannot answer")
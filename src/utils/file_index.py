@@ -1,8 +1,10 @@
 """Smart file discovery and indexing system for efficient data access."""
 
 import json
+import os
+from fnmatch import fnmatch
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 
 
@@ -36,6 +38,8 @@ class FileIndex:
         self.workspace_root = Path(workspace_root)
         self.data_dir = Path(data_dir) if data_dir else None
         self.index: Dict[str, FileMetadata] = {}
+        # Absolute path -> its parts relative to each root it was scanned from
+        self._relative_parts: Dict[str, List[Tuple[str, ...]]] = {}
         self._indexed = False
         
     def build_index(self, force_refresh: bool = False) -> None:
@@ -48,6 +52,7 @@ class FileIndex:
             return
             
         self.index.clear()
+        self._relative_parts.clear()
         
         # Index workspace
         self._scan_directory(self.workspace_root, max_depth=5)
@@ -58,50 +63,51 @@ class FileIndex:
             
         self._indexed = True
         
-    def _scan_directory(self, root_path: Path, max_depth: int, current_depth: int = 0) -> None:
-        """Recursively scan directory and index files.
-        
+    def _scan_directory(self, root_path: Path, max_depth: int) -> None:
+        """Scan a directory tree iteratively and index its files.
+
+        Uses os.scandir, whose entries carry their file type (and cache their
+        stat result), so each file costs one stat call at most.
+
         Args:
             root_path: Directory to scan
-            max_depth: Maximum recursion depth
-            current_depth: Current recursion level
+            max_depth: Maximum depth below root_path
         """
-        if current_depth > max_depth:
-            return
-            
         # Skip common irrelevant directories
         skip_dirs = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'env', '.tox', 
                     'dist', 'build', '.pytest_cache', '.mypy_cache', 'egg-info'}
-        
-        try:
-            for item in root_path.iterdir():
-                # Skip hidden files and directories at root level
-                if item.name.startswith('.') and current_depth == 0:
-                    continue
-                    
-                if item.is_dir():
-                    # Skip irrelevant directories
-                    if item.name in skip_dirs:
-                        continue
-                    # Recurse into subdirectory
-                    self._scan_directory(item, max_depth, current_depth + 1)
-                    
-                elif item.is_file():
-                    # Index this file
-                    metadata = self._create_metadata(item)
-                    # Use absolute path as key to handle files from different root directories
-                    abs_path = str(item.absolute())
-                    self.index[abs_path] = metadata
-                    
-        except PermissionError:
-            # Skip directories we can't read
-            pass
+
+        stack = [(os.path.abspath(root_path), ())]
+        while stack:
+            directory, relative_dir = stack.pop()
+            depth = len(relative_dir)
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        # Skip hidden files and directories at root level
+                        if depth == 0 and entry.name.startswith('.'):
+                            continue
+
+                        if entry.is_dir():
+                            # Skip irrelevant directories
+                            if entry.name not in skip_dirs and depth < max_depth:
+                                stack.append((entry.path, relative_dir + (entry.name,)))
+
+                        elif entry.is_file():
+                            # Use absolute path as key to handle files from different root directories
+                            self.index[entry.path] = self._create_metadata(Path(entry.path), entry.stat().st_size)
+                            self._relative_parts.setdefault(entry.path, []).append(relative_dir + (entry.name,))
+
+            except (PermissionError, FileNotFoundError):
+                # Skip directories we can't read (or that vanished mid-scan)
+                pass
             
-    def _create_metadata(self, file_path: Path) -> FileMetadata:
+    def _create_metadata(self, file_path: Path, size_bytes: Optional[int] = None) -> FileMetadata:
         """Create metadata entry for a file.
         
         Args:
             file_path: Path to file
+            size_bytes: File size if already known (avoids another stat call)
             
         Returns:
             FileMetadata object
@@ -129,7 +135,7 @@ class FileIndex:
             path=str(file_path),
             name=file_path.name,
             extension=ext,
-            size_bytes=file_path.stat().st_size,
+            size_bytes=size_bytes if size_bytes is not None else file_path.stat().st_size,
             category=category,
             subcategory=subcategory
         )
@@ -142,7 +148,10 @@ class FileIndex:
         """Search indexed files by criteria.
         
         Args:
-            pattern: Glob pattern to match against filename (e.g., '*exhaustion*.csv', '**/Q5/*.csv')
+            pattern: Glob pattern. Without a '/' it is matched against the
+                filename (e.g., '*exhaustion*.csv'); with one, it is matched
+                like glob.glob(recursive=True) from the indexed root, or from
+                '/' if absolute (e.g., '**/Q5/*.csv', 'Q5/*')
             category: Filter by category ('data', 'config', etc.)
             extension: Filter by extension (with or without dot)
             name_contains: Filter files whose name contains this string (case-insensitive)
@@ -154,6 +163,7 @@ class FileIndex:
             self.build_index()
             
         results = []
+        segments = _split_glob(pattern) if pattern and '/' in pattern else None
         
         for abs_path, metadata in self.index.items():
             # Apply filters
@@ -169,8 +179,14 @@ class FileIndex:
                 if name_contains.lower() not in metadata.name.lower():
                     continue
                     
-            if pattern:
-                from fnmatch import fnmatch
+            if segments is not None:
+                if pattern.startswith('/'):
+                    candidates = [Path(abs_path).parts[1:]]
+                else:
+                    candidates = self._relative_parts.get(abs_path, [])
+                if not any(_glob_match(segments, parts) for parts in candidates):
+                    continue
+            elif pattern:
                 # Match pattern against filename or path
                 if not (fnmatch(metadata.name, pattern) or fnmatch(abs_path, pattern)):
                     continue
@@ -257,12 +273,78 @@ class FileIndex:
         return summary
 
 
-# Singleton instance for workspace
-_file_index: Optional[FileIndex] = None
+def _split_glob(pattern: str) -> Tuple[Tuple[str, bool], ...]:
+    """Split a path pattern into (segment, has_wildcards) pairs.
+
+    Empty segments (from '//' or a leading/trailing '/') are dropped, and
+    consecutive '**' segments are collapsed, as glob does.
+    """
+    segments = []
+    for segment in pattern.split('/'):
+        if not segment or (segment == '**' and segments and segments[-1][0] == '**'):
+            continue
+        segments.append((segment, any(c in segment for c in '*?[')))
+    return tuple(segments)
+
+
+def _glob_match(segments: Tuple[Tuple[str, bool], ...], parts: Tuple[str, ...]) -> bool:
+    """Whether a file's path parts match a split pattern with glob semantics.
+
+    As in glob.glob(recursive=True): '**' spans zero or more directories
+    but never enters hidden ones, wildcards do not match names starting with
+    '.' unless the segment does, and literal segments are compared directly.
+
+    Args:
+        segments: Pattern from _split_glob
+        parts: Path components, ending with the file name
+
+    Returns:
+        True if the path matches
+    """
+    if not segments:
+        return not parts
+    segment, magic = segments[0]
+    if segment == '**':
+        if len(segments) == 1:
+            # A trailing '**' matches everything below, hidden entries excepted
+            return bool(parts) and not any(part.startswith('.') for part in parts)
+        if _glob_match(segments[1:], parts):
+            return True
+        # Consume one directory (never the file name itself)
+        return len(parts) > 1 and not parts[0].startswith('.') and _glob_match(segments, parts[1:])
+    if not parts:
+        return False
+    if magic:
+        if parts[0].startswith('.') and not segment.startswith('.'):
+            return False
+        if not fnmatch(parts[0], segment):
+            return False
+    elif parts[0] != segment:
+        return False
+    return _glob_match(segments[1:], parts[1:])
+
+
+def _directory_signature(*directories: Optional[str]) -> Tuple[int, ...]:
+    """Modification times of the given directories (0 if missing)."""
+    signature = []
+    for directory in directories:
+        try:
+            signature.append(os.stat(directory).st_mtime_ns if directory else 0)
+        except OSError:
+            signature.append(0)
+    return tuple(signature)
+
+
+# Built indexes keyed by (workspace_root, data_dir), with the directory
+# signature they were built against
+_file_indexes: Dict[Tuple[str, Optional[str]], Tuple[Tuple[int, ...], FileIndex]] = {}
 
 
 def get_file_index(workspace_root: str = ".", data_dir: Optional[str] = None) -> FileIndex:
-    """Get or create the global file index.
+    """Get or create the file index for a workspace.
+
+    Indexes are cached per (workspace_root, data_dir) and rebuilt when either
+    directory's modification time changes.
     
     Args:
         workspace_root: Workspace root directory
@@ -271,13 +353,17 @@ def get_file_index(workspace_root: str = ".", data_dir: Optional[str] = None) ->
     Returns:
         FileIndex instance
     """
-    global _file_index
-    
-    if _file_index is None:
-        _file_index = FileIndex(workspace_root, data_dir)
-        _file_index.build_index()
-        
-    return _file_index
+    key = (os.path.abspath(workspace_root), os.path.abspath(data_dir) if data_dir else None)
+    signature = _directory_signature(*key)
+
+    cached = _file_indexes.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    file_index = FileIndex(workspace_root, data_dir)
+    file_index.build_index()
+    _file_indexes[key] = (signature, file_index)
+    return file_index
 
 
 def smart_find_files(question: str, workspace_root: str = ".", data_dir: Optional[str] = None) -> List[str]:
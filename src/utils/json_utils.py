@@ -0,0 +1,71 @@
+"""Fast JSON helpers for hot-path tool and API serialization.
+
+Uses orjson when it is installed and falls back to the standard library.
+Both paths stringify values JSON cannot represent natively (e.g. numpy
+scalars from pandas records) instead of raising.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson is not None else 0
+)
+_ORJSON_CANONICAL_OPTIONS = _ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if orjson is not None else 0)
+
+# json.dumps builds a new JSONEncoder whenever non-default options are passed;
+# reuse preconfigured ones on the fallback path
+_ENCODER = json.JSONEncoder(default=str)
+_CANONICAL_ENCODER = json.JSONEncoder(default=str, sort_keys=True, separators=(",", ":"))
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to a JSON string.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS).decode()
+    return _ENCODER.encode(obj)
+
+
+def dumps_canonical(obj: Any) -> str:
+    """Serialize obj compactly with sorted keys, for use as a cache key.
+
+    Equal objects give equal strings regardless of dict insertion order.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=_ORJSON_CANONICAL_OPTIONS).decode()
+    return _CANONICAL_ENCODER.encode(obj)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Deserialize JSON text or bytes.
+
+    Raises json.JSONDecodeError on malformed input (orjson's error type
+    subclasses it).
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Decoded object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,417 @@
+"""Semantic response cache for the CLI.
+
+Answers are keyed on a sentence embedding of the question, so a rephrased
+question can reuse an earlier answer instead of re-running the agent.
+Embeddings are searched with FAISS when it is installed (numpy otherwise);
+responses and their embeddings persist in SQLite under ~/.coscientist/semcache/.
+
+Once enough entries exist, the search index holds PCA-reduced vectors
+(8-bit scalar-quantized under FAISS) so lookups touch far fewer bytes; the
+full embeddings stay in SQLite so the projection can be refitted. Larger
+caches are searched through an HNSW graph saved alongside the store.
+
+Questions are canonicalized (case, filler phrases, whitespace, edge
+punctuation) before lookup; an exact canonical match is answered without
+embedding the question at all. Context placed before a "Question:" line is
+not canonicalized away: its hash becomes part of the cache partition.
+"""
+
+import hashlib
+import importlib.util
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:  # Optional dependency
+    faiss = None
+
+DEFAULT_CACHE_DIR = Path.home() / ".coscientist" / "semcache"
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Politeness filler that does not change what is being asked
+FILLER = ("i would like to know", "could you", "can you", "tell me", "please")
+_FILLER_RE = re.compile(r"\b(?:" + "|".join(re.escape(f) for f in FILLER) + r")\b")
+_WHITESPACE_RE = re.compile(r"\s+")
+_EDGE_PUNCT = "?!.,;: "
+# Marker separating retrieved context from the actual question in a prompt
+_QUESTION_MARKER = "\nQuestion:"
+
+
+def _canonicalize(question: str) -> str:
+    """Normalize a question so trivially different phrasings share a cache key.
+
+    Args:
+        question: Question text, without any context preceding it
+
+    Returns:
+        Lowercased question without filler, runs of whitespace or edge punctuation
+    """
+    text = _FILLER_RE.sub(" ", question.lower())
+    return _WHITESPACE_RE.sub(" ", text).strip(_EDGE_PUNCT)
+
+
+def _split_question(text: str) -> tuple[str, str]:
+    """Split text into (context, question) at the last "Question:" marker.
+
+    Text without the marker is all question, with empty context.
+    """
+    if _QUESTION_MARKER in text:
+        context, question = text.rsplit(_QUESTION_MARKER, 1)
+        return context.strip(), question
+    return "", text
+
+
+def _cache_key(question: str, scope: str) -> tuple[str, str]:
+    """Partition and canonical question a prompt is cached under.
+
+    Only the question is canonicalized. Context preceding it goes into the
+    partition as a hash, so the same question asked about different
+    context never shares an entry.
+
+    Args:
+        question: Raw question text, possibly with context before a marker
+        scope: Cache partition given by the caller
+
+    Returns:
+        Tuple of (partition, canonical question)
+    """
+    context, question = _split_question(question)
+    if context:
+        digest = hashlib.blake2b(context.encode(), digest_size=16).hexdigest()
+        scope = f"{scope}|context:{digest}"
+    return scope, _canonicalize(question)
+
+
+class SemanticCache:
+    """Embedding-keyed store of agent responses."""
+
+    # Nearest neighbours examined per lookup (hits must also match the scope)
+    SEARCH_K = 5
+    # PCA is fitted once this many entries exist, and refitted whenever the
+    # entry count has doubled since the last fit
+    PCA_MIN_ENTRIES = 1000
+    PCA_COMPONENTS = 128
+    # Recently computed question embeddings kept for store() / prefetch()
+    EMBEDDING_MEMO_SIZE = 32
+    # Above this many entries FAISS search switches from a linear scan to an
+    # HNSW graph, which is persisted so it is not rebuilt on every start
+    HNSW_MIN_ENTRIES = 2000
+    HNSW_M = 16
+    HNSW_EF_CONSTRUCTION = 40
+    HNSW_EF_SEARCH = 16
+
+    def __init__(self, cache_dir: Optional[str] = None, threshold: float = 0.90, model_name: str = DEFAULT_MODEL):
+        """Open (or create) the cache.
+
+        Args:
+            cache_dir: Directory for the SQLite store (defaults to ~/.coscientist/semcache)
+            threshold: Minimum cosine similarity for a hit
+            model_name: sentence-transformers model used to embed questions
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.model_name = model_name
+        self.hits = 0
+        self.misses = 0
+        # Cleared by callers that stop using the cache after an error
+        self.enabled = True
+
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._embedding_memo: OrderedDict[str, np.ndarray] = OrderedDict()
+
+        self._db = sqlite3.connect(self.cache_dir / "responses.sqlite")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "id INTEGER PRIMARY KEY, scope TEXT NOT NULL, question TEXT NOT NULL, "
+            "payload TEXT NOT NULL, embedding BLOB NOT NULL, created REAL NOT NULL)"
+        )
+        self._db.commit()
+
+        self._ids: list[int] = []
+        # Partitions from _cache_key; the database keeps the caller's scope
+        self._scopes: list[str] = []
+        # (partition, canonical question) -> row id, for the exact-match fast path
+        self._exact: dict[tuple[str, str], int] = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._index = None
+        self._index_vectors: Optional[np.ndarray] = None
+        self._pca_path = self.cache_dir / "pca.npz"
+        self._index_path = self.cache_dir / "index.faiss"
+        self._index_dirty = False
+        self._pca: Optional[dict[str, Any]] = None
+        self._load()
+
+    @staticmethod
+    def is_available() -> bool:
+        """Whether the embedding model dependency is installed."""
+        return importlib.util.find_spec("sentence_transformers") is not None
+
+    def _load(self):
+        """Load stored embeddings and the PCA projection, then build the index."""
+        if self._pca_path.exists():
+            with np.load(self._pca_path) as data:
+                self._pca = {key: data[key] for key in data.files}
+
+        rows = self._db.execute("SELECT id, scope, question, embedding FROM responses ORDER BY id").fetchall()
+        if not rows:
+            return
+        self._ids = [row[0] for row in rows]
+        keys = [_cache_key(row[2], row[1]) for row in rows]
+        self._scopes = [partition for partition, _question in keys]
+        self._exact = {key: row[0] for key, row in zip(keys, rows)}
+        self._vectors = np.vstack([np.frombuffer(row[3], dtype=np.float32) for row in rows])
+        if not self._load_saved_index():
+            self._rebuild_index()
+
+    def _load_saved_index(self) -> bool:
+        """Reuse the persisted HNSW index if it still covers every stored entry."""
+        if faiss is None or not self._index_path.exists() or self._pca_is_stale():
+            return False
+        if len(self._ids) < self.HNSW_MIN_ENTRIES:
+            return False
+        try:
+            index = faiss.read_index(str(self._index_path))
+        except RuntimeError:
+            return False
+        if index.ntotal != len(self._ids):
+            return False
+
+        index.hnsw.efSearch = self.HNSW_EF_SEARCH
+        self._index = index
+        self._index_vectors = self._project(self._vectors)
+        return True
+
+    def _save_index(self):
+        """Persist an HNSW index (flat indexes are cheap to rebuild and are not saved)."""
+        if not self._index_dirty:
+            return
+        faiss.write_index(self._index, str(self._index_path))
+        self._index_dirty = False
+
+    def _fit_pca(self):
+        """Fit the PCA projection on the stored embeddings and persist it."""
+        mean = self._vectors.mean(axis=0)
+        _, _, vt = np.linalg.svd(self._vectors - mean, full_matrices=False)
+        self._pca = {
+            "mean": mean.astype(np.float32),
+            "components": vt[:self.PCA_COMPONENTS].T.astype(np.float32),
+            "fitted_count": np.array(len(self._ids)),
+        }
+        np.savez(self._pca_path, **self._pca)
+
+    def _pca_is_stale(self) -> bool:
+        """Whether the projection should be (re)fitted for the current entry count."""
+        count = len(self._ids)
+        if count < self.PCA_MIN_ENTRIES:
+            return False
+        return self._pca is None or count >= 2 * int(self._pca["fitted_count"])
+
+    def _project(self, vectors: np.ndarray) -> np.ndarray:
+        """Map full embeddings into the index space (unit length)."""
+        if self._pca is None:
+            return vectors
+        reduced = (vectors - self._pca["mean"]) @ self._pca["components"]
+        norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+        return (reduced / np.maximum(norms, 1e-12)).astype(np.float32)
+
+    def _rebuild_index(self):
+        """Rebuild the search index from the full stored embeddings."""
+        if self._pca_is_stale():
+            self._fit_pca()
+
+        projected = self._project(self._vectors)
+        self._index_vectors = projected
+        if faiss is None:
+            self._index = None
+            return
+
+        dim = projected.shape[1]
+        hnsw = len(self._ids) >= self.HNSW_MIN_ENTRIES
+        if hnsw and self._pca is not None:
+            self._index = faiss.IndexHNSWSQ(
+                dim, faiss.ScalarQuantizer.QT_8bit, self.HNSW_M, faiss.METRIC_INNER_PRODUCT
+            )
+            self._index.train(projected)
+        elif hnsw:
+            self._index = faiss.IndexHNSWFlat(dim, self.HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        elif self._pca is not None:
+            self._index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+            self._index.train(projected)
+        else:
+            self._index = faiss.IndexFlatIP(dim)
+
+        if hnsw:
+            self._index.hnsw.efConstruction = self.HNSW_EF_CONSTRUCTION
+            self._index.hnsw.efSearch = self.HNSW_EF_SEARCH
+        self._index.add(projected)
+        self._index_dirty = hnsw
+        if hnsw:
+            self._save_index()
+
+    def _encoder(self):
+        """Load the embedding model on first use.
+
+        If warm_up() is still loading it, this waits for that load to finish.
+        """
+        with self._model_lock:
+            if self._model is None:
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.model_name)
+            return self._model
+
+    def warm_up(self):
+        """Start loading the embedding model in a background thread.
+
+        The import and model load take a second or more; starting them early
+        overlaps that with agent setup and the user typing a question.
+        """
+        threading.Thread(target=self._encoder, name="semcache-warmup", daemon=True).start()
+
+    def _remember(self, question: str, vector: np.ndarray):
+        """Keep a question's embedding for reuse by lookup() and store()."""
+        self._embedding_memo[question] = vector
+        self._embedding_memo.move_to_end(question)
+        while len(self._embedding_memo) > self.EMBEDDING_MEMO_SIZE:
+            self._embedding_memo.popitem(last=False)
+
+    def _embed(self, question: str) -> np.ndarray:
+        """Embed a canonicalized question as a unit-length float32 row vector.
+
+        Recent embeddings are memoized, so a store() after a missed lookup()
+        (or a lookup() after prefetch()) does not encode the question again.
+        """
+        vector = self._embedding_memo.get(question)
+        if vector is None:
+            vector = self._encoder().encode([question], normalize_embeddings=True).astype(np.float32)
+            self._remember(question, vector)
+        return vector
+
+    def prefetch(self, questions: list[str], batch_size: int = 8):
+        """Embed several upcoming questions in one batched forward pass.
+
+        Args:
+            questions: Questions that will be looked up next
+            batch_size: Encoder batch size
+        """
+        canonical = (_cache_key(q, "")[1] for q in questions)
+        pending = [q for q in dict.fromkeys(canonical) if q not in self._embedding_memo]
+        if not pending:
+            return
+        vectors = self._encoder().encode(pending, batch_size=batch_size, normalize_embeddings=True)
+        for question, vector in zip(pending, vectors.astype(np.float32)):
+            self._remember(question, vector[None, :])
+
+    def _search(self, vector: np.ndarray) -> list[tuple[float, int]]:
+        """Return (similarity, position) of the nearest stored entries."""
+        if not self._ids:
+            return []
+
+        k = min(self.SEARCH_K, len(self._ids))
+        query = self._project(vector)
+        if self._index is not None:
+            scores, positions = self._index.search(query, k)
+            return [(float(s), int(p)) for s, p in zip(scores[0], positions[0]) if p >= 0]
+
+        scores = self._index_vectors @ query[0]
+        positions = np.argsort(-scores)[:k]
+        return [(float(scores[p]), int(p)) for p in positions]
+
+    def lookup(self, question: str, scope: str) -> Optional[tuple[dict[str, Any], float]]:
+        """Find a cached response for a semantically equivalent question.
+
+        Args:
+            question: The user question
+            scope: Cache partition (mode, model, input data); hits must match it
+
+        Returns:
+            Tuple of (stored payload, similarity), or None on a miss
+        """
+        scope, question = _cache_key(question, scope)
+        row_id = self._exact.get((scope, question))
+        if row_id is not None:
+            payload = self._payload(row_id)
+            if payload is not None:
+                self.hits += 1
+                return payload, 1.0
+
+        # The index scores PCA-projected, quantized vectors; it only picks the
+        # candidates, and the threshold is applied to their exact cosine
+        vector = self._embed(question)
+        candidates = sorted(
+            ((float(self._vectors[position] @ vector[0]), position) for _score, position in self._search(vector)),
+            reverse=True,
+        )
+        for score, position in candidates:
+            if score < self.threshold:
+                break
+            if self._scopes[position] != scope:
+                continue
+            payload = self._payload(self._ids[position])
+            if payload is not None:
+                self.hits += 1
+                return payload, score
+
+        self.misses += 1
+        return None
+
+    def _payload(self, row_id: int) -> Optional[dict[str, Any]]:
+        """Load a stored payload by row id."""
+        row = self._db.execute("SELECT payload FROM responses WHERE id = ?", (row_id,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def store(self, question: str, scope: str, payload: dict[str, Any]):
+        """Cache a response.
+
+        Args:
+            question: The user question
+            scope: Cache partition the response belongs to
+            payload: JSON-serializable response fields
+        """
+        partition, canonical = _cache_key(question, scope)
+        vector = self._embed(canonical)
+        cursor = self._db.execute(
+            "INSERT INTO responses (scope, question, payload, embedding, created) VALUES (?, ?, ?, ?, ?)",
+            (scope, question, json.dumps(payload), vector.tobytes(), time.time()),
+        )
+        self._db.commit()
+
+        self._ids.append(cursor.lastrowid)
+        self._scopes.append(partition)
+        self._exact[(partition, canonical)] = cursor.lastrowid
+        self._vectors = vector if self._vectors is None else np.vstack([self._vectors, vector])
+        crosses_hnsw = faiss is not None and len(self._ids) == self.HNSW_MIN_ENTRIES
+        if self._index_vectors is None or self._pca_is_stale() or crosses_hnsw:
+            self._rebuild_index()
+            return
+
+        projected = self._project(vector)
+        self._index_vectors = np.vstack([self._index_vectors, projected])
+        if self._index is not None:
+            self._index.add(projected)
+            self._index_dirty = hasattr(self._index, "hnsw")
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters for this session and the number of stored entries."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._ids),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        """Persist a modified HNSW index and close the SQLite connection."""
+        self._save_index()
+        self._db.close()
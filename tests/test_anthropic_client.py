@@ -0,0 +1,55 @@
+"""Tests for building Anthropic request bodies."""
+
+import threading
+
+import pytest
+
+from src.agent.anthropic_client import AnthropicClient
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+@pytest.fixture
+def client():
+    return AnthropicClient(api_key="test-key", model="test-model")
+
+
+def test_system_prompt_and_last_tool_are_marked_cacheable(client):
+    tools = [{"name": "read_file"}, {"name": "find_files"}]
+
+    payload = client._build_payload(MESSAGES, tools, 0.7, 100, "system prompt")
+
+    assert payload["system"] == [{"type": "text", "text": "system prompt", "cache_control": {"type": "ephemeral"}}]
+    assert payload["tools"][0] == {"name": "read_file"}
+    assert payload["tools"][1]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in tools[1]
+    assert client._build_payload(MESSAGES, tools, 0.7, 100, "system prompt")["tools"] is payload["tools"]
+
+
+def test_agents_sharing_a_client_keep_their_own_system_prompt(client):
+    compared, resume = threading.Event(), threading.Event()
+
+    class PausingPrompt(str):
+        """Prompt whose memo comparison waits until another agent has called."""
+
+        def __ne__(self, other):
+            result = str.__ne__(self, other)
+            compared.set()
+            resume.wait(timeout=5)
+            return result
+
+    client._build_payload(MESSAGES, None, 0.7, 100, "You are the immunologist.")
+    payloads = []
+    immunologist = threading.Thread(target=lambda: payloads.append(
+        client._build_payload(MESSAGES, None, 0.7, 100, PausingPrompt("You are the immunologist."))
+    ))
+    immunologist.start()
+    assert compared.wait(timeout=5)
+
+    # Another specialist's request lands while the first is mid-build
+    geneticist = client._build_payload(MESSAGES, None, 0.7, 100, "You are the geneticist.")
+    resume.set()
+    immunologist.join()
+
+    assert geneticist["system"][0]["text"] == "You are the geneticist."
+    assert payloads[0]["system"][0]["text"] == "You are the immunologist."
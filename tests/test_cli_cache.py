@@ -0,0 +1,87 @@
+"""Tests for how the CLI uses the semantic response cache."""
+
+import argparse
+
+from src.cli import _cached_answer, _close_semantic_cache, _open_semantic_cache
+from src.utils import semantic_cache
+
+
+class RecordingCache:
+    """Stand-in for SemanticCache that records stores and can fail."""
+
+    def __init__(self, hit=None, fail_on=None):
+        self.enabled = True
+        self.hit = hit
+        self.fail_on = fail_on
+        self.stored = []
+
+    def lookup(self, question, scope):
+        if self.fail_on == "lookup":
+            raise OSError("embedding model unavailable")
+        return self.hit
+
+    def store(self, question, scope, payload):
+        if self.fail_on == "store":
+            raise OSError("database is locked")
+        self.stored.append((question, scope, payload))
+
+    def close(self):
+        if self.fail_on == "close":
+            raise OSError("disk I/O error")
+
+
+def test_hit_is_returned_without_computing():
+    cache = RecordingCache(hit=({"answer": "cached"}, 0.97))
+
+    payload = _cached_answer(cache, "single", "question", lambda: {"answer": "fresh"}, "answer")
+
+    assert payload == {"answer": "cached"}
+    assert cache.stored == []
+
+
+def test_miss_is_computed_and_stored():
+    cache = RecordingCache()
+
+    payload = _cached_answer(cache, "single", "question", lambda: {"answer": "fresh"}, "answer")
+
+    assert payload == {"answer": "fresh"}
+    assert cache.stored == [("question", "single", {"answer": "fresh"})]
+
+
+def test_empty_answer_is_not_stored():
+    cache = RecordingCache()
+
+    _cached_answer(cache, "single", "question", lambda: {"answer": ""}, "answer")
+
+    assert cache.stored == []
+
+
+def test_cache_errors_disable_the_cache_but_keep_the_answer(capsys):
+    for action in ("lookup", "store"):
+        cache = RecordingCache(fail_on=action)
+
+        payload = _cached_answer(cache, "single", "question", lambda: {"answer": "fresh"}, "answer")
+
+        assert payload == {"answer": "fresh"}
+        assert not cache.enabled
+        assert f"{action} failed" in capsys.readouterr().err
+
+
+def test_cache_that_cannot_be_opened_is_skipped(monkeypatch, capsys):
+    def fail(self, threshold=None):
+        raise OSError("unable to open database file")
+
+    monkeypatch.setattr(semantic_cache.SemanticCache, "is_available", staticmethod(lambda: True))
+    monkeypatch.setattr(semantic_cache.SemanticCache, "__init__", fail)
+    args = argparse.Namespace(no_cache=False, virtual_lab=False, combined=False, langgraph=False,
+                              cache_threshold=0.9)
+
+    assert _open_semantic_cache(args) is None
+    assert "open failed" in capsys.readouterr().err
+
+
+def test_close_errors_are_only_reported(capsys):
+    _close_semantic_cache(None)
+    _close_semantic_cache(RecordingCache(fail_on="close"))
+
+    assert "close failed" in capsys.readouterr().err
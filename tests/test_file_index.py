@@ -0,0 +1,99 @@
+"""Tests for the workspace file index behind find_files."""
+
+import glob
+import os
+
+import pytest
+
+from src.utils.file_index import FileIndex, get_file_index
+
+
+def _touch(root, relative):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("x")
+    return path
+
+
+def _names(results):
+    return sorted(meta.name for meta in results)
+
+
+def test_scan_indexes_nested_files_and_skips_hidden_root_entries(tmp_path):
+    _touch(tmp_path, "a.csv")
+    _touch(tmp_path, "Q5/b.csv")
+    _touch(tmp_path, "Q5/deep/c.tsv")
+    _touch(tmp_path, ".env")
+    _touch(tmp_path, "__pycache__/d.csv")
+
+    index = FileIndex(str(tmp_path))
+    index.build_index()
+
+    assert sorted(os.path.relpath(p, tmp_path) for p in index.index) == ["Q5/b.csv", "Q5/deep/c.tsv", "a.csv"]
+    assert index.index[str(tmp_path / "Q5/deep/c.tsv")].category == "data"
+
+
+def test_shallow_wildcard_matches_direct_children_only(tmp_path):
+    _touch(tmp_path, "Q5/b.csv")
+    _touch(tmp_path, "Q5/deep/c.csv")
+    _touch(tmp_path, "other/d.csv")
+
+    index = FileIndex(str(tmp_path))
+
+    assert _names(index.find_files(pattern="**/Q5/*.csv")) == ["b.csv"]
+    assert _names(index.find_files(pattern="*.csv")) == ["b.csv", "c.csv", "d.csv"]
+
+
+def test_index_is_cached_per_root_and_rebuilt_on_change(tmp_path):
+    first, second = tmp_path / "first", tmp_path / "second"
+    _touch(first, "a.csv")
+    _touch(second, "b.csv")
+
+    index = get_file_index(str(first))
+    assert get_file_index(str(first)) is index
+    assert _names(get_file_index(str(second)).find_files()) == ["b.csv"]
+
+    _touch(first, "new.csv")
+    os.utime(first, ns=(0, os.stat(first).st_mtime_ns + 1_000_000_000))
+
+    rebuilt = get_file_index(str(first))
+    assert rebuilt is not index
+    assert _names(rebuilt.find_files()) == ["a.csv", "new.csv"]
+
+
+GLOB_TREE = [
+    "a.csv", "x1.csv", "xa/xb.csv",
+    "dir/y.csv", "dir/x2.txt", "dir/.x5.csv",
+    "dir/sub/x3.csv", "dir/sub/deep/z.csv",
+    "dir/.hidden/x4.csv", "dir/.hidden/inner/x7.csv",
+    "Q5/a.csv", "Q5/deep/b.csv", "other/Q5/c.csv",
+]
+
+
+@pytest.mark.parametrize("pattern", [
+    "**/x*", "dir/*", "dir/**", "dir/**/*.csv", "**/Q5/*.csv", "*/x*", "*/*/*",
+    "dir/.*", "dir/.hidden/*", "**/.hidden/*", "**/.hidden/**", "**/*.csv", "Q5/**/b.csv",
+])
+def test_path_patterns_match_like_recursive_glob(tmp_path, pattern):
+    for relative in GLOB_TREE:
+        _touch(tmp_path, relative)
+    index = FileIndex(str(tmp_path))
+
+    found = sorted(os.path.relpath(meta.path, tmp_path) for meta in index.find_files(pattern=pattern))
+    expected = sorted(
+        match for match in glob.glob(pattern, root_dir=tmp_path, recursive=True)
+        if (tmp_path / match).is_file()
+    )
+
+    assert found == expected
+
+
+def test_path_patterns_are_relative_to_the_indexed_root(tmp_path):
+    root = tmp_path / "Q5"
+    _touch(root, "a.csv")
+    _touch(root, "Q5/b.csv")
+
+    index = FileIndex(str(root))
+
+    assert _names(index.find_files(pattern="**/Q5/*.csv")) == ["b.csv"]
+    assert _names(index.find_files(pattern=f"{root}/*.csv")) == ["a.csv"]
@@ -0,0 +1,76 @@
+"""Tests for trimming the conversation history to the context window."""
+
+from src.agent.agent import BioinformaticsAgent, get_max_tokens_for_model
+
+
+def _tool_turn(turn, size):
+    assistant = {
+        "role": "assistant",
+        "content": "",
+        "tool_calls": [{"id": f"call_{turn}", "type": "function", "function": {"name": "read_file", "arguments": "{}"}}],
+    }
+    result = {"role": "tool", "tool_call_id": f"call_{turn}", "content": "x" * size}
+    return [assistant, result]
+
+
+def _make_agent(tmp_path, turns, size):
+    agent = BioinformaticsAgent(api_key="test-key", provider="openrouter", model="test/model", data_dir=str(tmp_path))
+    agent.conversation_history = [
+        {"role": "system", "content": "system prompt"},
+        {"role": "user", "content": "question"},
+    ]
+    for turn in range(turns):
+        messages = _tool_turn(turn, size)
+        agent.conversation_history.extend(messages)
+        agent._tool_turns.append(messages)
+    return agent
+
+
+def _fit(agent, turns_that_fit):
+    """Shrink the context limit so roughly turns_that_fit tool turns fit."""
+    history_tokens = sum(agent._message_tokens(m) for m in agent.conversation_history[:4])
+    agent.CONTEXT_LIMIT_TOKENS = (
+        get_max_tokens_for_model(agent.client.model)
+        + agent.CONTEXT_MARGIN_TOKENS
+        + history_tokens * turns_that_fit
+    )
+
+
+def test_history_within_budget_is_untouched(tmp_path):
+    agent = _make_agent(tmp_path, turns=3, size=100)
+    before = list(agent.conversation_history)
+
+    agent._trim_history()
+
+    assert agent.conversation_history == before
+
+
+def test_oldest_turns_are_dropped_with_their_tool_results(tmp_path):
+    agent = _make_agent(tmp_path, turns=6, size=4000)
+    _fit(agent, turns_that_fit=3)
+
+    agent._trim_history()
+
+    history = agent.conversation_history
+    assert [m["content"] for m in history[:2]] == ["system prompt", "question"]
+    kept = [m["tool_call_id"] for m in history if m["role"] == "tool"]
+    assert kept == [f"call_{turn}" for turn in range(6)][-len(kept):]
+    assert 0 < len(kept) < 6
+    # Every remaining tool result still follows the assistant call it answers
+    for index, message in enumerate(history):
+        if message["role"] == "tool":
+            assert history[index - 1]["tool_calls"][0]["id"] == message["tool_call_id"]
+    # Compaction bookkeeping only refers to messages still in the history
+    remaining = {id(m) for m in history}
+    assert all(id(m) in remaining for turn in agent._tool_turns for m in turn)
+    assert len(agent._tool_turns) == len(kept)
+
+
+def test_token_count_is_recomputed_when_content_is_replaced(tmp_path):
+    agent = _make_agent(tmp_path, turns=1, size=4000)
+    message = agent.conversation_history[-1]
+    full = agent._message_tokens(message)
+
+    message["content"] = "summary"
+
+    assert agent._message_tokens(message) < full
@@ -0,0 +1,28 @@
+"""Tests for the pooled HTTP session shared by the API clients."""
+
+from src.agent.http_session import PooledSessionMixin
+
+
+class _Client(PooledSessionMixin):
+    def __init__(self):
+        self._init_sessions()
+
+
+def _retry():
+    return _Client()._session.get_adapter("https://openrouter.ai/api/v1").max_retries
+
+
+def test_rejected_posts_are_retried():
+    retry = _retry()
+
+    assert retry.is_retry("POST", 429, has_retry_after=True)
+    assert retry.is_retry("POST", 503)
+    assert retry.respect_retry_after_header
+
+
+def test_posts_that_may_have_been_processed_are_not_retried():
+    retry = _retry()
+
+    for status in (500, 502, 504):
+        assert not retry.is_retry("POST", status)
+    assert retry.read == 0
@@ -0,0 +1,53 @@
+"""Tests for the in-process and on-disk PubMed search cache."""
+
+import pytest
+
+from src.tools import _pubmed_cache
+from src.tools.implementations import ToolResult
+
+
+@pytest.fixture
+def searches(tmp_path, monkeypatch):
+    """Record live searches; the disk layer uses JSON files under tmp_path."""
+    calls = []
+
+    def fake_search(query, max_results=10, retmax=100):
+        calls.append(query)
+        if query == "fails":
+            return ToolResult(False, None, "NCBI unavailable")
+        return ToolResult(True, [{"pmid": str(len(calls)), "query": query}])
+
+    monkeypatch.setattr(_pubmed_cache, "search_pubmed", fake_search)
+    monkeypatch.setattr(_pubmed_cache, "diskcache", None)
+    monkeypatch.setattr(_pubmed_cache, "PUBMED_CACHE_DIR", tmp_path / "pubmed")
+    _pubmed_cache._search.cache_clear()
+    yield calls
+    _pubmed_cache._search.cache_clear()
+
+
+def test_repeated_search_is_served_from_cache(searches):
+    first = _pubmed_cache.cached_search_pubmed("EGFR inhibitors")
+    _pubmed_cache._search.cache_clear()  # as in a new process
+    second = _pubmed_cache.cached_search_pubmed("EGFR inhibitors")
+
+    assert second.output == first.output
+    assert searches == ["EGFR inhibitors"]
+
+
+def test_entries_expire_after_the_ttl(searches, monkeypatch):
+    _pubmed_cache.cached_search_pubmed("EGFR inhibitors")
+    _pubmed_cache._search.cache_clear()
+
+    now = _pubmed_cache.time.time()
+    monkeypatch.setattr(_pubmed_cache.time, "time", lambda: now + _pubmed_cache.PUBMED_CACHE_TTL + 1)
+    _pubmed_cache.cached_search_pubmed("EGFR inhibitors")
+
+    assert searches == ["EGFR inhibitors", "EGFR inhibitors"]
+
+
+def test_failed_searches_are_not_cached(searches):
+    assert not _pubmed_cache.cached_search_pubmed("fails").success
+    assert not _pubmed_cache.cached_search_pubmed("fails").success
+
+    assert searches == ["fails", "fails"]
+    assert not (_pubmed_cache.PUBMED_CACHE_DIR).exists()
@@ -0,0 +1,100 @@
+"""Tests for the persistent execute_python session."""
+
+import threading
+
+import pytest
+
+from src.tools.implementations import PersistentPythonExecutor
+
+
+def _count_runs(executor, monkeypatch):
+    runs = []
+    execute_locked = executor._execute_locked
+
+    def counting(code):
+        runs.append(code)
+        return execute_locked(code)
+
+    monkeypatch.setattr(executor, "_execute_locked", counting)
+    return runs
+
+
+def test_print_only_snippet_is_memoized_until_state_changes(monkeypatch):
+    executor = PersistentPythonExecutor()
+    executor.execute("x = 3\nshape = (10, 'genes')")
+    runs = _count_runs(executor, monkeypatch)
+
+    assert executor.execute("print(x * 2, shape[1])") == (True, "6 genes", None)
+    # Same snippet on unchanged state: answered from the memo, not re-run
+    assert executor.execute("print(x * 2, shape[1])") == (True, "6 genes", None)
+    assert len(runs) == 1
+
+    executor.execute("x = 4")
+    assert executor.execute("print(x * 2, shape[1])") == (True, "8 genes", None)
+
+
+@pytest.mark.parametrize("setup, snippet, outputs", [
+    ("it = iter([1, 2])", "print(it.__next__)", None),
+    ("items = [1]", "print(items)", None),
+    (
+        "class Counter:\n"
+        "    calls = 0\n"
+        "    @property\n"
+        "    def now(self):\n"
+        "        type(self).calls += 1\n"
+        "        return type(self).calls\n"
+        "c = Counter()",
+        "print(c.now)",
+        ["1", "2"],
+    ),
+    ("import time", "print(time.time)", None),
+    ("def print(*args):\n    pass", "print(1)", None),
+])
+def test_snippets_reading_changeable_values_are_rerun(monkeypatch, setup, snippet, outputs):
+    executor = PersistentPythonExecutor()
+    executor.execute(setup)
+    runs = _count_runs(executor, monkeypatch)
+
+    first = executor.execute(snippet)
+    second = executor.execute(snippet)
+
+    assert len(runs) == 2
+    if outputs is not None:
+        assert [first[1], second[1]] == outputs
+
+
+def test_failed_snippet_reports_first_error():
+    executor = PersistentPythonExecutor()
+    executor.execute("x = 1")
+
+    success, _, error = executor.execute("print(x.missing, undefined)")
+    assert not success
+    assert "AttributeError" in error
+
+    success, _, error = executor.execute("print(1 / 0, undefined)")
+    assert not success
+    assert "ZeroDivisionError" in error
+
+
+def test_output_of_other_threads_is_not_captured(capsys):
+    executor = PersistentPythonExecutor()
+    started = threading.Event()
+    stop = threading.Event()
+
+    def chatter():
+        started.set()
+        while not stop.is_set():
+            print("from another thread")
+            stop.wait(0.001)
+
+    thread = threading.Thread(target=chatter)
+    thread.start()
+    started.wait()
+    try:
+        result = executor.execute("import time\nfor i in range(3):\n    time.sleep(0.01)\n    print(i)")
+    finally:
+        stop.set()
+        thread.join()
+
+    assert result == (True, "0\n1\n2", None)
+    assert "from another thread" in capsys.readouterr().out
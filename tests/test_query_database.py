@@ -0,0 +1,68 @@
+"""Tests for column searches in the local databases."""
+
+import pytest
+
+from src.tools import implementations
+from src.tools.implementations import query_database
+
+PHAROS_ROWS = (
+    "Symbol,Drug,Activity\n"
+    "CYP2D6,Fluoxetine,7.1\n"
+    "CYP3A4,Ketoconazole,8.2\n"
+    "cyp2d6,Paroxetine,\n"
+    "EGFR,Gefitinib,9.0\n"
+)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    pharos = tmp_path / "data" / "Drug" / "Pharos"
+    pharos.mkdir(parents=True)
+    (pharos / "pharos_drugs.csv").write_text(PHAROS_ROWS)
+    monkeypatch.setattr(implementations, "TABLE_CACHE_DIR", tmp_path / "table_cache")
+    return str(tmp_path / "data")
+
+
+def test_pharos_column_search_is_case_insensitive_substring(data_dir):
+    result = query_database("pharos", "Symbol:CYP2D", data_dir=data_dir)
+
+    assert result.success
+    assert [row["Drug"] for row in result.output["results"]] == ["Fluoxetine", "Paroxetine"]
+    assert result.output["count"] == 2
+    assert result.output["rows_searched"] == 4
+
+
+def test_pharos_column_search_respects_limit(data_dir):
+    result = query_database("pharos", "Symbol:cyp", limit=2, data_dir=data_dir)
+
+    assert [row["Drug"] for row in result.output["results"]] == ["Fluoxetine", "Ketoconazole"]
+
+
+def test_pharos_search_on_numeric_column(data_dir):
+    result = query_database("pharos", "Activity:8.", data_dir=data_dir)
+
+    assert [row["Drug"] for row in result.output["results"]] == ["Ketoconazole"]
+
+
+def test_pharos_column_search_strips_whitespace(data_dir):
+    result = query_database("pharos", " Symbol : CYP3A4 ", data_dir=data_dir)
+
+    assert [row["Drug"] for row in result.output["results"]] == ["Ketoconazole"]
+
+
+def test_pharos_unknown_column_lists_available_columns(data_dir):
+    result = query_database("pharos", "Gene:CYP2D6", data_dir=data_dir)
+
+    assert not result.success
+    assert "Column 'Gene' not found" in result.error
+    assert "Symbol" in result.error
+
+
+@pytest.mark.parametrize("cached_table", [True, False])
+def test_pharos_value_is_matched_literally(data_dir, monkeypatch, cached_table):
+    if not cached_table:
+        monkeypatch.setattr(implementations, "_load_csv_table", lambda file_path: None)
+
+    assert query_database("pharos", "Activity:8.2", data_dir=data_dir).output["count"] == 1
+    # "." is not a regex wildcard, with or without pyarrow
+    assert query_database("pharos", "Symbol:CYP.D6", data_dir=data_dir).output["count"] == 0
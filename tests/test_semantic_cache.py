@@ -0,0 +1,124 @@
+"""Tests for the semantic answer cache, using a deterministic fake encoder."""
+
+import numpy as np
+import pytest
+
+from src.utils.semantic_cache import SemanticCache
+
+DIMENSIONS = 32
+
+
+@pytest.fixture
+def vectors():
+    """Question -> unit embedding; unseen questions get a random vector."""
+    rng = np.random.default_rng(0)
+    table = {}
+
+    def embed(cache, question):
+        if question not in table:
+            vector = rng.standard_normal((1, DIMENSIONS)).astype(np.float32)
+            table[question] = vector / np.linalg.norm(vector)
+        return table[question]
+
+    return table, embed
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch, vectors):
+    _table, embed = vectors
+    monkeypatch.setattr(SemanticCache, "_embed", embed)
+    opened = SemanticCache(cache_dir=str(tmp_path), threshold=0.9)
+    yield opened
+    opened.close()
+
+
+def _near(base, cosine, seed=1):
+    """A unit vector whose cosine similarity with base is exactly `cosine`."""
+    noise = np.random.default_rng(seed).standard_normal(base.shape).astype(np.float32)
+    noise -= (noise @ base.T) * base
+    noise /= np.linalg.norm(noise)
+    return (cosine * base + np.sqrt(1 - cosine ** 2) * noise).astype(np.float32)
+
+
+def test_exact_question_hits_after_canonicalization(cache):
+    cache.store("What drugs target EGFR?", "scope", {"response": "gefitinib"})
+
+    assert cache.lookup("what drugs target egfr", "scope") == ({"response": "gefitinib"}, 1.0)
+    assert cache.lookup("what drugs target egfr", "other scope") is None
+
+
+def test_context_before_the_question_partitions_the_cache(cache):
+    cache.store("Genes: EGFR, KRAS\nQuestion: Which gene is mutated?", "scope", {"response": "KRAS"})
+
+    hit = cache.lookup("Genes: EGFR, KRAS\nQuestion: which gene is mutated", "scope")
+    assert hit == ({"response": "KRAS"}, 1.0)
+    # Same question, different context: neither the exact path nor the
+    # embedding search may reuse the answer
+    assert cache.lookup("Genes: TP53, BRCA1\nQuestion: Which gene is mutated?", "scope") is None
+    assert cache.lookup("Which gene is mutated?", "scope") is None
+
+
+def test_context_partition_survives_reopening(tmp_path, monkeypatch, vectors):
+    _table, embed = vectors
+    monkeypatch.setattr(SemanticCache, "_embed", embed)
+    first = SemanticCache(cache_dir=str(tmp_path), threshold=0.9)
+    first.store("Genes: EGFR\nQuestion: Which gene is mutated?", "scope", {"response": "EGFR"})
+    first.close()
+
+    reopened = SemanticCache(cache_dir=str(tmp_path), threshold=0.9)
+    try:
+        assert reopened.lookup("Which gene is mutated?", "scope") is None
+        assert reopened.lookup("Genes: EGFR\nQuestion: Which gene is mutated?", "scope")[1] == 1.0
+    finally:
+        reopened.close()
+
+
+def test_threshold_applies_to_cosine_similarity(cache, vectors):
+    table, _embed = vectors
+    cache.store("stored question", "scope", {"response": "answer"})
+    base = table["stored question"]
+    table["close question"] = _near(base, 0.95)
+    table["distant question"] = _near(base, 0.85)
+
+    hit = cache.lookup("close question", "scope")
+    assert hit is not None
+    assert hit[0] == {"response": "answer"}
+    assert hit[1] == pytest.approx(0.95, abs=1e-4)
+    assert cache.lookup("distant question", "scope") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_threshold_uses_exact_score_once_vectors_are_projected(tmp_path, monkeypatch, vectors):
+    table, embed = vectors
+    monkeypatch.setattr(SemanticCache, "_embed", embed)
+    monkeypatch.setattr(SemanticCache, "PCA_MIN_ENTRIES", 40)
+    monkeypatch.setattr(SemanticCache, "PCA_COMPONENTS", 8)
+    cache = SemanticCache(cache_dir=str(tmp_path), threshold=0.9)
+    try:
+        for i in range(60):
+            cache.store(f"question {i}", "scope", {"i": i})
+        base = table["question 7"]
+        table["just below"] = _near(base, 0.89)
+        table["just above"] = _near(base, 0.91)
+
+        assert cache.lookup("just below", "scope") is None
+        hit = cache.lookup("just above", "scope")
+        assert hit is not None and hit[0] == {"i": 7}
+        assert hit[1] == pytest.approx(0.91, abs=1e-4)
+    finally:
+        cache.close()
+
+
+def test_entries_persist_across_instances(tmp_path, monkeypatch, vectors):
+    _table, embed = vectors
+    monkeypatch.setattr(SemanticCache, "_embed", embed)
+    first = SemanticCache(cache_dir=str(tmp_path))
+    first.store("stored question", "scope", {"response": "answer"})
+    first.close()
+
+    second = SemanticCache(cache_dir=str(tmp_path))
+    try:
+        assert second.stats()["entries"] == 1
+        assert second.lookup("stored question", "scope") == ({"response": "answer"}, 1.0)
+    finally:
+        second.close()
@@ -0,0 +1,112 @@
+"""Tests for reassembling streamed chat/completions deltas."""
+
+import json
+
+from src.agent.openrouter_client import OpenRouterClient, _StreamAccumulator
+
+
+def _tool_delta(index, call_id=None, name=None, arguments=None):
+    fragment = {"index": index, "function": {}}
+    if call_id is not None:
+        fragment["id"] = call_id
+        fragment["type"] = "function"
+    if name is not None:
+        fragment["function"]["name"] = name
+    if arguments is not None:
+        fragment["function"]["arguments"] = arguments
+    return {"choices": [{"delta": {"tool_calls": [fragment]}}]}
+
+
+def test_split_arguments_emit_once_complete():
+    accumulator = _StreamAccumulator()
+    assert accumulator.feed(_tool_delta(0, "call_1", "read_file", '{"file_pa')) == []
+    assert accumulator.feed(_tool_delta(0, arguments='th": "a.csv"')) == []
+
+    completed = accumulator.feed(_tool_delta(0, arguments="}"))
+
+    assert [(index, call["id"]) for index, call in completed] == [(0, "call_1")]
+    assert json.loads(completed[0][1]["function"]["arguments"]) == {"file_path": "a.csv"}
+    assert accumulator.finish() == []
+
+
+def test_closing_brace_inside_string_is_not_complete():
+    accumulator = _StreamAccumulator()
+    assert accumulator.feed(_tool_delta(0, "call_1", "execute_python", '{"code": "d = {}')) == []
+    assert accumulator.feed(_tool_delta(0, arguments='"}')) != []
+
+
+def test_missing_ids_are_kept_apart_by_index():
+    accumulator = _StreamAccumulator()
+    completed = accumulator.feed(_tool_delta(0, "", "execute_python", '{"code": "print(1)"}'))
+    completed += accumulator.feed(_tool_delta(1, "", "execute_python", '{"code": "print(2)"}'))
+
+    assert [(index, call["id"]) for index, call in completed] == [(0, ""), (1, "")]
+    assert accumulator.finish() == []
+
+
+def test_interleaved_fragments_emit_each_call_once_complete():
+    accumulator = _StreamAccumulator()
+    completed = accumulator.feed(_tool_delta(0, "", "execute_python", '{"code": '))
+    # A later index starting does not make the earlier call complete
+    completed += accumulator.feed(_tool_delta(1, "", "execute_python", '{"code": '))
+    assert completed == []
+
+    completed += accumulator.feed(_tool_delta(0, arguments='"print(1)"}'))
+    completed += accumulator.feed(_tool_delta(1, arguments='"print(2)"}'))
+
+    assert [(index, call["function"]["arguments"]) for index, call in completed] == [
+        (0, '{"code": "print(1)"}'),
+        (1, '{"code": "print(2)"}'),
+    ]
+    assert accumulator.finish() == []
+
+
+def test_incomplete_arguments_are_emitted_at_the_end():
+    accumulator = _StreamAccumulator()
+    accumulator.feed(_tool_delta(0, "a", "execute_python", '{"code": "print(1)"'))
+    accumulator.feed(_tool_delta(1, "b", "find_files", '{"pattern": "*.csv"}'))
+
+    assert [(index, call["id"]) for index, call in accumulator.finish()] == [(0, "a")]
+
+
+def test_response_matches_emitted_calls_in_order():
+    accumulator = _StreamAccumulator()
+    accumulator.feed({"choices": [{"delta": {"content": "Checking "}}]})
+    streamed = accumulator.feed(_tool_delta(1, "b", "find_files", '{"pattern": "*.csv"}'))
+    streamed += accumulator.feed(_tool_delta(0, "a", "read_file", '{"file_path": "x"}'))
+    accumulator.feed({"choices": [{"delta": {"content": "files"}, "finish_reason": "tool_calls"}]})
+    streamed += accumulator.finish()
+
+    response = accumulator.to_response()
+    message = response["choices"][0]["message"]
+    assert message["content"] == "Checking files"
+    assert response["choices"][0]["finish_reason"] == "tool_calls"
+    assert [call["id"] for call in message["tool_calls"]] == ["a", "b"]
+    assert sorted((index, call["id"]) for index, call in streamed) == [(0, "a"), (1, "b")]
+
+
+def test_extract_tool_calls_keeps_calls_without_id(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    accumulator = _StreamAccumulator()
+    accumulator.feed(_tool_delta(0, "", "execute_python", '{"code": "x = 1"}'))
+    accumulator.finish()
+
+    calls = OpenRouterClient().extract_tool_calls(accumulator.to_response())
+
+    assert [(call["name"], call["input"]) for call in calls] == [("execute_python", {"code": "x = 1"})]
+
+
+def test_malformed_calls_are_kept_with_an_error(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    accumulator = _StreamAccumulator()
+    accumulator.feed(_tool_delta(0, "bad", "read_file", '{"file_path": '))
+    accumulator.feed(_tool_delta(1, "empty", "execute_python", '{}'))
+    accumulator.feed(_tool_delta(2, "good", "find_files", '{"pattern": "*.csv"}'))
+    accumulator.finish()
+
+    calls = OpenRouterClient().extract_tool_calls(accumulator.to_response())
+
+    assert [(call["id"], call["index"]) for call in calls] == [("bad", 0), ("empty", 1), ("good", 2)]
+    assert "Malformed arguments" in calls[0]["error"]
+    assert "code" in calls[1]["error"]
+    assert "error" not in calls[2]
@@ -0,0 +1,135 @@
+"""Tests for per-turn output budgets and the full-budget retry."""
+
+import json
+
+import pytest
+
+from src.agent.agent import BioinformaticsAgent, get_max_tokens_for_model
+from src.agent.anthropic_client import AnthropicClient
+from src.agent.openrouter_client import OpenRouterClient
+
+FULL_BUDGET = get_max_tokens_for_model("test/model")
+
+
+def _tool_response(call_id, finish_reason="tool_calls", name="find_files", arguments=None):
+    call = {
+        "id": call_id,
+        "type": "function",
+        "function": {"name": name, "arguments": json.dumps(arguments or {"pattern": "*.csv"})},
+    }
+    message = {"role": "assistant", "content": "", "tool_calls": [call]}
+    return {"choices": [{"message": message, "finish_reason": finish_reason}]}
+
+
+def _text_response(text, finish_reason="stop"):
+    return {"choices": [{"message": {"role": "assistant", "content": text}, "finish_reason": finish_reason}]}
+
+
+class ScriptedClient(OpenRouterClient):
+    """OpenRouter client that returns canned responses and records budgets."""
+
+    def __init__(self, responses):
+        super().__init__(api_key="test-key", model="test/model")
+        self.responses = list(responses)
+        self.budgets = []
+
+    def create_message(self, messages, tools=None, temperature=0.7, max_tokens=4096, top_p=1.0):
+        self.budgets.append(max_tokens)
+        return self.responses.pop(0)
+
+
+class ScriptedAnthropicClient(AnthropicClient):
+    """Anthropic client that returns canned responses and records budgets."""
+
+    def __init__(self, responses):
+        super().__init__(api_key="test-key", model="test-model")
+        self.responses = list(responses)
+        self.budgets = []
+
+    def create_message(self, messages, tools=None, temperature=0.7, max_tokens=4096, system=None):
+        self.budgets.append(max_tokens)
+        return self.responses.pop(0)
+
+
+def _anthropic_tool_response(call_id):
+    block = {"type": "tool_use", "id": call_id, "name": "find_files", "input": {"pattern": "*.csv"}}
+    return {"content": [block], "stop_reason": "tool_use"}
+
+
+def _anthropic_text_response(text, stop_reason="end_turn"):
+    return {"content": [{"type": "text", "text": text}], "stop_reason": stop_reason}
+
+
+class _Result:
+    def to_dict(self):
+        return {"success": True, "output": ["a.csv"], "error": None}
+
+
+def _make_agent(tmp_path, responses):
+    agent = BioinformaticsAgent(api_key="test-key", provider="openrouter", model="test/model",
+                                data_dir=str(tmp_path), stream=False)
+    agent.client = ScriptedClient(responses)
+    agent.tools = {"find_files": lambda **kwargs: _Result(), "execute_python": lambda **kwargs: _Result()}
+    return agent
+
+
+def test_turn_after_tool_results_gets_routing_budget(tmp_path):
+    agent = _make_agent(tmp_path, [_tool_response("call_1"), _text_response("answer")])
+
+    assert agent.run("question") == "answer"
+    assert agent.client.budgets == [FULL_BUDGET, agent.ROUTING_MAX_TOKENS]
+
+
+def test_turn_after_code_output_gets_full_budget(tmp_path):
+    agent = _make_agent(tmp_path, [
+        _tool_response("call_1", name="execute_python", arguments={"code": "print(1)"}),
+        _text_response("answer"),
+    ])
+
+    assert agent.run("question") == "answer"
+    assert agent.client.budgets == [FULL_BUDGET, FULL_BUDGET]
+
+
+def _truncated_answer_turns(provider):
+    if provider == "openrouter":
+        return [
+            _tool_response("call_1"),
+            _text_response("partial", finish_reason="length"),
+            _text_response("complete answer"),
+        ]
+    return [
+        _anthropic_tool_response("toolu_1"),
+        _anthropic_text_response("partial", stop_reason="max_tokens"),
+        _anthropic_text_response("complete answer"),
+    ]
+
+
+@pytest.mark.parametrize("provider", ["openrouter", "anthropic"])
+def test_truncated_answer_is_retried_at_full_budget(tmp_path, provider):
+    agent = _make_agent(tmp_path, [])
+    if provider == "anthropic":
+        agent.client = ScriptedAnthropicClient(_truncated_answer_turns(provider))
+    else:
+        agent.client.responses = _truncated_answer_turns(provider)
+    full_budget = get_max_tokens_for_model(agent.client.model)
+
+    assert agent.run("question") == "complete answer"
+    assert agent.client.budgets == [full_budget, agent.ROUTING_MAX_TOKENS, full_budget]
+
+
+def test_truncated_tool_call_turn_is_not_retried(tmp_path):
+    agent = _make_agent(tmp_path, [
+        _tool_response("call_1"),
+        _tool_response("call_2", finish_reason="length"),
+        _text_response("answer"),
+    ])
+
+    assert agent.run("question") == "answer"
+    assert agent.client.budgets == [FULL_BUDGET, agent.ROUTING_MAX_TOKENS, agent.ROUTING_MAX_TOKENS]
+
+
+def test_answer_cut_off_at_full_budget_is_not_retried(tmp_path):
+    agent = _make_agent(tmp_path, [_text_response("long", finish_reason="length")])
+
+    assert agent.run("question") == "long"
+    assert agent.client.budgets == [FULL_BUDGET]
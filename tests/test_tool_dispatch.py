@@ -0,0 +1,197 @@
+"""Tests for how the agent loops dispatch streamed tool calls."""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from src.agent.agent import BioinformaticsAgent
+from src.agent.openrouter_client import OpenRouterClient, _StreamAccumulator
+
+
+def _tool_turn(*calls, interleaved=False):
+    """Chunks for one streamed turn; each call is (name, arguments, id).
+
+    Arguments are split in two fragments so calls only complete mid-stream.
+    With interleaved, every call's first half is streamed before any rest.
+    Arguments given as a string are sent as-is, to stream malformed JSON.
+    """
+    firsts, rests = [], []
+    for index, (name, arguments, call_id) in enumerate(calls):
+        encoded = arguments if isinstance(arguments, str) else json.dumps(arguments)
+        half = len(encoded) // 2
+        firsts.append({"choices": [{"delta": {"tool_calls": [{
+            "index": index, "id": call_id, "type": "function",
+            "function": {"name": name, "arguments": encoded[:half]},
+        }]}}]})
+        rests.append({"choices": [{"delta": {"tool_calls": [{
+            "index": index, "function": {"arguments": encoded[half:]},
+        }]}}]})
+    if interleaved:
+        chunks = firsts + rests
+    else:
+        chunks = [chunk for pair in zip(firsts, rests) for chunk in pair]
+    chunks.append({"choices": [{"delta": {}, "finish_reason": "tool_calls"}]})
+    return chunks
+
+
+def _text_turn(text):
+    return [{"choices": [{"delta": {"content": text}, "finish_reason": "stop"}]}]
+
+
+class FakeStreamClient(OpenRouterClient):
+    """OpenRouter client that replays canned stream chunks, one turn per call."""
+
+    def __init__(self, turns):
+        super().__init__(api_key="test-key", model="test/model")
+        self.turns = list(turns)
+
+    def _events(self):
+        accumulator = _StreamAccumulator()
+        for chunk in self.turns.pop(0):
+            for index, call in accumulator.feed(chunk):
+                yield "tool_call", self._parse_tool_call(call, index)
+        for index, call in accumulator.finish():
+            yield "tool_call", self._parse_tool_call(call, index)
+        yield "response", accumulator.to_response()
+
+    def stream_message(self, **kwargs):
+        yield from self._events()
+
+    async def astream_message(self, **kwargs):
+        for event in self._events():
+            yield event
+
+
+class _Result:
+    def __init__(self, output):
+        self.output = output
+
+    def to_dict(self):
+        return {"success": True, "output": self.output, "error": None}
+
+
+class RecordingTools:
+    """Stand-ins for a mutating and a read-only tool that log each run."""
+
+    def __init__(self):
+        self.log = []
+        self._lock = threading.Lock()
+
+    def execute_python(self, code):
+        # The first call is the slowest, so a reordering would show
+        time.sleep(0.05 if code == "first" else 0.0)
+        with self._lock:
+            self.log.append(code)
+        return _Result(f"ran {code}")
+
+    def find_files(self, pattern, data_dir=None):
+        time.sleep(0.05 if pattern == "slow" else 0.0)
+        with self._lock:
+            self.log.append(pattern)
+        return _Result(f"found {pattern}")
+
+
+def _make_agent(tmp_path, turns, tools):
+    agent = BioinformaticsAgent(api_key="test-key", provider="openrouter", model="test/model", data_dir=str(tmp_path))
+    agent.client = FakeStreamClient(turns)
+    agent.tools = {"execute_python": tools.execute_python, "find_files": tools.find_files}
+    return agent
+
+
+def _run(agent, mode):
+    if mode == "sync":
+        return agent.run("question")
+    return asyncio.run(agent.arun("question"))
+
+
+def _tool_messages(agent):
+    return [message for message in agent.conversation_history if message["role"] == "tool"]
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_streamed_call_without_id_runs_once(tmp_path, mode):
+    tools = RecordingTools()
+    turns = [_tool_turn(("execute_python", {"code": "first"}, "")), _text_turn("done")]
+    agent = _make_agent(tmp_path, turns, tools)
+
+    assert _run(agent, mode) == "done"
+    assert tools.log == ["first"]
+    assert [json.loads(m["content"])["output"] for m in _tool_messages(agent)] == ["ran first"]
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_repeated_ids_keep_results_aligned(tmp_path, mode):
+    tools = RecordingTools()
+    turns = [
+        _tool_turn(("find_files", {"pattern": "slow"}, "dup"), ("find_files", {"pattern": "fast"}, "dup")),
+        _text_turn("done"),
+    ]
+    agent = _make_agent(tmp_path, turns, tools)
+
+    _run(agent, mode)
+
+    assert sorted(tools.log) == ["fast", "slow"]
+    assert [json.loads(m["content"])["output"] for m in _tool_messages(agent)] == ["found slow", "found fast"]
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_mutating_calls_run_in_request_order(tmp_path, mode):
+    tools = RecordingTools()
+    turns = [
+        _tool_turn(
+            ("execute_python", {"code": "first"}, "a"),
+            ("find_files", {"pattern": "fast"}, "b"),
+            ("execute_python", {"code": "second"}, "c"),
+        ),
+        _text_turn("done"),
+    ]
+    agent = _make_agent(tmp_path, turns, tools)
+
+    _run(agent, mode)
+
+    executed = [entry for entry in tools.log if entry in ("first", "second")]
+    assert executed == ["first", "second"]
+    # The read-only call does not wait for the slow mutating one
+    assert tools.log.index("fast") < tools.log.index("first")
+    assert [m["tool_call_id"] for m in _tool_messages(agent)] == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_interleaved_fragments_run_each_call_once(tmp_path, mode):
+    tools = RecordingTools()
+    turns = [
+        _tool_turn(
+            ("execute_python", {"code": "first"}, ""),
+            ("execute_python", {"code": "second"}, ""),
+            interleaved=True,
+        ),
+        _text_turn("done"),
+    ]
+    agent = _make_agent(tmp_path, turns, tools)
+
+    assert _run(agent, mode) == "done"
+    assert tools.log == ["first", "second"]
+    assert [json.loads(m["content"])["output"] for m in _tool_messages(agent)] == ["ran first", "ran second"]
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_malformed_call_is_answered_with_an_error(tmp_path, mode):
+    tools = RecordingTools()
+    turns = [
+        _tool_turn(
+            ("execute_python", '{"code": "unterminated', "bad"),
+            ("find_files", {"pattern": "fast"}, "good"),
+        ),
+        _text_turn("done"),
+    ]
+    agent = _make_agent(tmp_path, turns, tools)
+
+    assert _run(agent, mode) == "done"
+    assert tools.log == ["fast"]
+    results = {m["tool_call_id"]: json.loads(m["content"]) for m in _tool_messages(agent)}
+    assert list(results) == ["bad", "good"]
+    assert not results["bad"]["success"] and "Malformed arguments" in results["bad"]["error"]
+    assert results["good"]["output"] == "found fast"
@@ -0,0 +1,81 @@
+"""Tests for correcting failed read_file calls without an LLM round-trip."""
+
+import json
+
+from src.agent.agent import BioinformaticsAgent
+
+
+def _make_agent(tmp_path):
+    agent = BioinformaticsAgent(api_key="test-key", provider="openrouter", model="test/model",
+                                data_dir=str(tmp_path), input_dir=str(tmp_path))
+    agent.conversation_history = [
+        {"role": "system", "content": "system prompt"},
+        {"role": "user", "content": "question"},
+    ]
+    return agent
+
+
+def _read(agent, file_path):
+    """Run one read_file call through the agent and apply the tool rules."""
+    tool_calls = [{"id": "call_1", "name": "read_file", "input": {"file_path": file_path}}]
+    results = agent._execute_tool_calls(tool_calls)
+    agent._add_tool_results(agent._collect_tool_results(tool_calls, results))
+    agent._apply_tool_rules(tool_calls, results)
+    return agent.conversation_history[2:]
+
+
+def test_missing_file_is_retried_with_its_unique_match(tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "Genes.csv").write_text("gene\nCD8A\n")
+    agent = _make_agent(tmp_path)
+
+    added = _read(agent, "genes.csv")
+
+    assert [m["role"] for m in added] == ["tool", "assistant", "tool"]
+    retry = added[1]["tool_calls"][0]
+    assert json.loads(retry["function"]["arguments"]) == {"file_path": "data/Genes.csv"}
+    assert added[2]["tool_call_id"] == retry["id"]
+    assert json.loads(added[2]["content"])["success"]
+    assert agent.saved_llm_calls == 1
+
+
+def test_missing_file_without_a_match_is_left_to_the_model(tmp_path):
+    (tmp_path / "notes.txt").write_text("unrelated")
+    agent = _make_agent(tmp_path)
+
+    added = _read(agent, "expression_matrix.csv")
+
+    assert [m["role"] for m in added] == ["tool"]
+    assert agent.saved_llm_calls == 0
+
+
+def test_similar_but_different_file_is_not_substituted(tmp_path):
+    (tmp_path / "CD8_counts.csv").write_text("gene\nCD8A\n")
+    agent = _make_agent(tmp_path)
+
+    added = _read(agent, "CD4_counts.csv")
+
+    assert [m["role"] for m in added] == ["tool"]
+    assert agent.saved_llm_calls == 0
+
+
+def test_ambiguous_name_is_not_corrected(tmp_path):
+    for folder in ("run1", "run2"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "counts.csv").write_text("gene\n")
+    agent = _make_agent(tmp_path)
+
+    added = _read(agent, "counts.csv")
+
+    assert [m["role"] for m in added] == ["tool"]
+
+
+def test_file_that_mentions_a_missing_file_is_not_reread(tmp_path):
+    (tmp_path / "pipeline.log").write_text("step 3: File not found: counts.csv\n")
+    agent = _make_agent(tmp_path)
+
+    added = _read(agent, "pipeline.log")
+
+    assert [m["role"] for m in added] == ["tool"]
+    assert json.loads(added[0]["content"])["success"]
+    assert agent.saved_llm_calls == 0